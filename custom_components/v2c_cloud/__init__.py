@@ -1,24 +1,48 @@
 """The V2C Cloud integration."""
 from __future__ import annotations
 
-import asyncio
 import logging
-from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
     CONF_API_TOKEN,
+    CONF_CONNECTION_TIMEOUT,
+    CONF_DEDICATED_SESSION,
     CONF_DEVICE_ID,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_OPENMETRICS,
+    CONF_RECORD_CASSETTE,
     CONF_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_STALE_MAX_AGE,
+    CONF_STALE_MAX_FAILURES,
+    CASSETTE_DIR,
+    COMMAND_BURST_DURATION,
+    DATA_ACCOUNTS,
+    DEFAULT_FAST_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
+    DEFAULT_STALE_MAX_AGE,
+    DEFAULT_STALE_MAX_FAILURES,
+    DEFAULT_TIMEOUT,
+    STORAGE_KEY,
+    STORAGE_VERSION,
 )
-from .v2c_api import V2CCloudAPI
+from .cassette import CassetteRecorder
+from .coordinator import V2CCloudAccountCoordinator, V2CCloudDataUpdateCoordinator
+from .openmetrics import async_get_exporter
+from .polling import AdaptivePollPolicy, StalenessBudget
+from .services import async_setup_services
+from .session import async_create_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,27 +53,102 @@ PLATFORMS: list[Platform] = [
     Platform.BUTTON,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the V2C Cloud services."""
+    hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up V2C Cloud from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    accounts = hass.data[DOMAIN].setdefault(DATA_ACCOUNTS, {})
+
+    api_token = entry.data[CONF_API_TOKEN]
+    if (account := accounts.get(api_token)) is None:
+        # Chargers sharing a token share the session of the first one set up
+        if entry.options.get(CONF_DEDICATED_SESSION, False):
+            session, connection_stats = async_create_session(hass)
+        else:
+            session, connection_stats = async_get_clientsession(hass), None
+        account = accounts[api_token] = V2CCloudAccountCoordinator(
+            hass=hass,
+            session=session,
+            api_token=api_token,
+            connection_stats=connection_stats,
+        )
+        _LOGGER.debug("Created the account of %s", entry.data[CONF_DEVICE_ID])
+
+    recorder = None
+    if entry.options.get(CONF_RECORD_CASSETTE, False):
+        recorder = CassetteRecorder(
+            hass.config.path(
+                DOMAIN,
+                CASSETTE_DIR,
+                f"{entry.data[CONF_DEVICE_ID]}-{dt_util.now():%Y%m%d-%H%M%S}.jsonl.gz",
+            ),
+            api_token,
+        )
+        # Entries are not unloaded on shutdown, flush on both
+        entry.async_on_unload(recorder.async_close)
+        entry.async_on_unload(
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, recorder.async_close)
+        )
 
-    session = async_get_clientsession(hass)
-    api = V2CCloudAPI(
-        session=session,
-        api_token=entry.data[CONF_API_TOKEN],
-        device_id=entry.data[CONF_DEVICE_ID],
+    api = account.create_api(
+        entry.data[CONF_DEVICE_ID],
+        timeout=entry.options.get(CONF_CONNECTION_TIMEOUT, DEFAULT_TIMEOUT),
+        recorder=recorder,
+    )
+
+    poll_policy = AdaptivePollPolicy(
+        fast=entry.options.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL),
+        medium=entry.options.get(
+            CONF_SCAN_INTERVAL,
+            entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        ),
+        slow=entry.options.get(CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL),
+        burst_duration=COMMAND_BURST_DURATION,
     )
 
-    scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-    
     coordinator = V2CCloudDataUpdateCoordinator(
         hass=hass,
         api=api,
-        scan_interval=scan_interval,
+        poll_policy=poll_policy,
+        account=account,
+        store=_async_get_store(hass, entry),
+        stale_budget=StalenessBudget(
+            max_failures=entry.options.get(
+                CONF_STALE_MAX_FAILURES, DEFAULT_STALE_MAX_FAILURES
+            ),
+            max_age=entry.options.get(CONF_STALE_MAX_AGE, DEFAULT_STALE_MAX_AGE),
+        ),
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    # With a cached snapshot the entities come up right away and the account
+    # polls the device as soon as it registers
+    try:
+        if not await coordinator.async_restore():
+            await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # Not registered yet, retries must not reuse an account left over
+        if account.device_count == 0:
+            accounts.pop(api_token, None)
+            await account.async_shutdown()
+            _LOGGER.debug(
+                "Shut down the account of %s, its setup failed",
+                entry.data[CONF_DEVICE_ID],
+            )
+        raise
+
+    entry.async_on_unload(account.async_register(coordinator))
+    if entry.options.get(CONF_OPENMETRICS, False):
+        if (exporter := async_get_exporter(hass)) is not None:
+            entry.async_on_unload(exporter.async_add(coordinator))
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -63,38 +162,35 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+
+        accounts = hass.data[DOMAIN][DATA_ACCOUNTS]
+        api_token = entry.data[CONF_API_TOKEN]
+        if (account := accounts.get(api_token)) is not None:
+            # The unload callbacks only run once we return, unregister now
+            # to know whether this was the last charger of the account
+            account.async_unregister(coordinator)
+            if account.device_count == 0:
+                await account.async_shutdown()
+                accounts.pop(api_token)
+                _LOGGER.debug(
+                    "Shut down the account of %s, its last charger",
+                    entry.data[CONF_DEVICE_ID],
+                )
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached device state of a deleted entry."""
+    await _async_get_store(hass, entry).async_remove()
+
+
+def _async_get_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store holding the last known state of an entry's device."""
+    return Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}")
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
-
-
-class V2CCloudDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the V2C Cloud API."""
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        api: V2CCloudAPI,
-        scan_interval: int,
-    ) -> None:
-        """Initialize."""
-        self.api = api
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=scan_interval),
-        )
-
-    async def _async_update_data(self):
-        """Update data via library."""
-        try:
-            return await self.api.get_device_status()
-        except Exception as exception:
-            raise UpdateFailed(exception) from exception
\ No newline at end of file
+    await hass.config_entries.async_reload(entry.entry_id)
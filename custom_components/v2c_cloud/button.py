@@ -33,9 +33,20 @@ async def async_setup_entry(
 class V2CCloudButton(V2CCloudEntity, ButtonEntity):
     """V2C Cloud button entity."""
 
+    _unrecorded_attributes = frozenset(
+        key
+        for info in BUTTON_TYPES.values()
+        for key in info.get("static_attributes", ())
+    )
+
     def __init__(self, coordinator, button_type: str, button_info: dict[str, Any]):
         """Initialize the button."""
-        super().__init__(coordinator, button_type)
+        super().__init__(
+            coordinator,
+            button_type,
+            button_info.get("source_fields"),
+            button_info.get("static_attributes"),
+        )
         self._button_info = button_info
         self._attr_icon = button_info.get("icon")
         
@@ -43,24 +54,6 @@ class V2CCloudButton(V2CCloudEntity, ButtonEntity):
         self._attr_translation_key = button_info.get("translation_key")
         self._attr_has_entity_name = True
 
-    def _safe_float(self, value: Any, default: float = 0.0) -> float:
-        """Safely convert any value to float."""
-        try:
-            if value is None:
-                return default
-            return float(value)
-        except (ValueError, TypeError):
-            return default
-
-    def _safe_int(self, value: Any, default: int = 0) -> int:
-        """Safely convert any value to int."""
-        try:
-            if value is None:
-                return default
-            return int(float(value))
-        except (ValueError, TypeError):
-            return default
-
     async def async_press(self) -> None:
         """Handle the button press."""
         try:
@@ -68,22 +61,30 @@ class V2CCloudButton(V2CCloudEntity, ButtonEntity):
             action_description = ""
             
             if self._type == "start_charge":
-                success = await self.coordinator.api.start_charging()
+                success = await self.coordinator.async_send_command(
+                    self.coordinator.api.start_charging
+                )
                 action_description = "start charging"
             elif self._type == "stop_charge":
-                success = await self.coordinator.api.stop_charging()
+                success = await self.coordinator.async_send_command(
+                    self.coordinator.api.stop_charging
+                )
                 action_description = "stop charging"
             elif self._type == "restart_device":
-                success = await self.coordinator.api.restart_device()
+                success = await self.coordinator.async_send_command(
+                    self.coordinator.api.restart_device
+                )
                 action_description = "restart device"
+                # Firmware and limits may change across a reboot
+                self.coordinator.invalidate_metadata()
             elif self._type == "reset_session":
-                success = await self.coordinator.api.reset_session()
+                success = await self.coordinator.async_send_command(
+                    self.coordinator.api.reset_session
+                )
                 action_description = "reset session"
             
             if success:
                 _LOGGER.info("Successfully executed: %s", action_description)
-                # Request refresh after action
-                await self.coordinator.async_request_refresh()
             else:
                 _LOGGER.error("Failed to execute: %s", action_description)
                 
@@ -91,53 +92,30 @@ class V2CCloudButton(V2CCloudEntity, ButtonEntity):
             _LOGGER.error("Error pressing button %s: %s", self._type, err)
             raise
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any] | None:
-        """Return additional state attributes."""
-        if not self.coordinator.data:
-            return None
-            
+    def _compute_attributes(self) -> dict[str, Any] | None:
+        """Derive the additional state attributes."""
         data = self.coordinator.data
+        if data is None:
+            return None
+
         attributes = {}
-        
+
         if self._type == "start_charge":
-            # FIXED: Safe conversion for charge_state
-            charge_state = self._safe_int(data.get("charge_state", 99))
             attributes.update({
-                "description": "Start EV charging session",
-                "requires_cable_connected": True,
-                "current_state": charge_state,
-                "can_start": charge_state in [1, 4],  # connected_not_charging or paused
-                "emhass_controlled": True,
+                "current_state": data.charge_state,
+                "can_start": data.charge_state in [1, 4],  # connected_not_charging or paused
             })
         elif self._type == "stop_charge":
-            # FIXED: Safe conversion for charge_state
-            charge_state = self._safe_int(data.get("charge_state", 99))
             attributes.update({
-                "description": "Stop current EV charging session",
-                "current_state": charge_state,
-                "can_stop": charge_state == 2,  # connected_charging
-                "preserves_connection": True,
-                "emhass_controlled": True,
-            })
-        elif self._type == "restart_device":
-            attributes.update({
-                "description": "Restart the V2C Trydan device",
-                "warning": "Will temporarily interrupt charging if active",
-                "use_case": "troubleshooting_connectivity_issues",
-                "restart_duration": "30-60 seconds",
+                "current_state": data.charge_state,
+                "can_stop": data.charge_state == 2,  # connected_charging
             })
         elif self._type == "reset_session":
-            # FIXED: Safe conversion for session data
-            session_energy = self._safe_float(data.get("session_energy", 0))
-            session_time = self._safe_float(data.get("session_time", 0))
             attributes.update({
-                "description": "Reset current charging session counters",
-                "current_session_energy": f"{session_energy/1000:.2f} kWh",
-                "current_session_time": f"{session_time} minutes",
-                "resets_counters": ["session_energy", "session_time"],
+                "current_session_energy": f"{data.session_energy/1000:.2f} kWh",
+                "current_session_time": f"{data.session_time} minutes",
             })
-        
+
         return attributes if attributes else None
 
     @property
@@ -0,0 +1,247 @@
+"""Record V2C Cloud responses to cassettes and replay them.
+
+A cassette is a gzipped JSON lines file, one line per request:
+
+    {"t": 12.5, "d": 0.21, "m": "GET", "e": "/device/reported",
+     "p": {"deviceId": "..."}, "s": 200, "b": "power:0,state:0,..."}
+
+`t` is when the request started, in seconds since recording started, `d`
+how long it took, `s` and `b` the status and body. Failed requests have
+`x` ("timeout" or "error") instead of a status and body. The API token is
+never written, occurrences of it in parameters or bodies are redacted.
+
+CassetteRecorder is handed to V2CCloudAPI, CassetteSession replaces its
+aiohttp session to answer from a cassette without any network access.
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict
+
+from .const import API_BASE_URL, CASSETTE_FLUSH_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+REDACTED = "**REDACTED**"
+
+
+class CassetteRecorder:
+    """Collect request/response pairs and append them to a cassette.
+
+    Interactions are buffered and written by an executor job once
+    CASSETTE_FLUSH_SIZE are pending and on close, so recording does not do
+    file I/O in the event loop.
+    """
+
+    def __init__(self, path: str | Path, api_token: str) -> None:
+        """Initialize, the file is created on the first flush."""
+        self.path = Path(path)
+        self._token = api_token
+        self._token_bytes = api_token.encode()
+        self._started = time.monotonic()
+        self._pending: list[str] = []
+        self._flushing: asyncio.Task | None = None
+        self.recorded = 0
+
+    def _redact(self, text: str) -> str:
+        return text.replace(self._token, REDACTED) if self._token else text
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        started: float,
+        status: int | None = None,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        failure: str | None = None,
+    ) -> None:
+        """Add one interaction, `started` is its time.monotonic() start."""
+        interaction: dict[str, Any] = {
+            "t": round(started - self._started, 3),
+            "d": round(time.monotonic() - started, 3),
+            "m": method,
+            "e": endpoint,
+        }
+        if params:
+            interaction["p"] = {
+                key: self._redact(str(value)) for key, value in params.items()
+            }
+        if failure is not None:
+            interaction["x"] = failure
+        else:
+            if self._token_bytes and self._token_bytes in body:
+                body = body.replace(self._token_bytes, REDACTED.encode())
+            interaction["s"] = status
+            # surrogateescape keeps bodies that are not UTF-8 byte for byte
+            interaction["b"] = body.decode("utf-8", "surrogateescape")
+            if headers:
+                interaction["h"] = headers
+        self._pending.append(json.dumps(interaction, separators=(",", ":")))
+        self.recorded += 1
+
+        if len(self._pending) >= CASSETTE_FLUSH_SIZE and self._flushing is None:
+            self._flushing = asyncio.get_running_loop().create_task(
+                self.async_flush()
+            )
+
+    async def async_flush(self) -> None:
+        """Append the pending interactions to the cassette."""
+        lines, self._pending = self._pending, []
+        try:
+            if lines:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._write, lines
+                )
+        except OSError as err:
+            _LOGGER.warning("Could not write cassette %s: %s", self.path, err)
+        finally:
+            self._flushing = None
+
+    async def async_close(self, _event: Any = None) -> None:
+        """Write everything recorded so far."""
+        if self._flushing is not None:
+            await self._flushing
+        await self.async_flush()
+
+    def _write(self, lines: list[str]) -> None:
+        """Append a gzip member, readers see one stream of lines."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, "at", encoding="utf-8") as cassette:
+            cassette.write("\n".join(lines) + "\n")
+
+
+def read_cassette(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Yield the interactions of a cassette in recording order."""
+    with gzip.open(path, "rt", encoding="utf-8") as cassette:
+        for line in cassette:
+            if line.strip():
+                yield json.loads(line)
+
+
+def interaction_body(interaction: dict[str, Any]) -> bytes:
+    """Return the response body of an interaction as received."""
+    return interaction.get("b", "").encode("utf-8", "surrogateescape")
+
+
+class _ReplayResponse:
+    """The part of aiohttp.ClientResponse V2CCloudAPI uses."""
+
+    def __init__(self, interaction: dict[str, Any]) -> None:
+        self.status = interaction["s"]
+        self.headers = CIMultiDict(interaction.get("h") or {})
+        self._body = interaction_body(interaction)
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def __aenter__(self) -> _ReplayResponse:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class _ReplayRequest:
+    """Awaitable context manager like the one aiohttp's request() returns."""
+
+    def __init__(self, session: CassetteSession, key: tuple) -> None:
+        self._session = session
+        self._key = key
+
+    async def __aenter__(self) -> _ReplayResponse:
+        return await self._session.async_answer(self._key)
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class CassetteSession:
+    """Stand-in for aiohttp.ClientSession answering from a cassette.
+
+    Requests are matched on method, endpoint and parameters, and every match
+    gets the next recorded answer for it. By default answers come at full
+    speed. With `realtime` they come at the pace they were recorded: an
+    answer is held until as long after the first one as when recording,
+    its own duration included. With `loop` a request replays its answers
+    again once they run out, otherwise it fails like a lost connection.
+    """
+
+    def __init__(
+        self,
+        interactions: Iterator[dict[str, Any]] | list[dict[str, Any]],
+        base_url: str = API_BASE_URL,
+        realtime: bool = False,
+        loop: bool = False,
+    ) -> None:
+        """Index the interactions."""
+        self._base_path = urlsplit(base_url).path
+        self.realtime = realtime
+        self.loop = loop
+        self._answers: defaultdict[tuple, deque] = defaultdict(deque)
+        # Recording time covered, looped answers come again this much later
+        self._span = 0.0
+        for interaction in interactions:
+            self._answers[
+                self._key(interaction["m"], interaction["e"], interaction.get("p"))
+            ].append(interaction)
+            self._span = max(self._span, interaction["t"] + interaction["d"])
+        # Loop time the recording started at, set by the first answer
+        self._epoch: float | None = None
+        self.replayed = 0
+        self.unmatched = 0
+
+    @property
+    def remaining(self) -> int:
+        """Return how many recorded answers were not replayed yet."""
+        return sum(len(answers) for answers in self._answers.values())
+
+    @staticmethod
+    def _key(method: str, endpoint: str, params: dict[str, Any] | None) -> tuple:
+        return method, endpoint, tuple(sorted((params or {}).items()))
+
+    def request(
+        self, method: str, url: str, params: dict[str, Any] | None = None, **_: Any
+    ) -> _ReplayRequest:
+        """Return the recorded answer to a request, see aiohttp's request()."""
+        endpoint = urlsplit(url).path.removeprefix(self._base_path)
+        params = {key: str(value) for key, value in (params or {}).items()}
+        return _ReplayRequest(self, self._key(method, endpoint, params))
+
+    async def async_answer(self, key: tuple) -> _ReplayResponse:
+        """Pop the next answer for `key`, raising what a failure recorded."""
+        answers = self._answers.get(key)
+        if not answers:
+            self.unmatched += 1
+            raise aiohttp.ClientConnectionError(f"No recorded answer for {key}")
+        interaction = answers.popleft()
+        if self.loop:
+            answers.append({**interaction, "t": interaction["t"] + self._span})
+        self.replayed += 1
+
+        if self.realtime:
+            now = asyncio.get_running_loop().time()
+            if self._epoch is None:
+                self._epoch = now - interaction["t"]
+            due = self._epoch + interaction["t"] + interaction["d"]
+            await asyncio.sleep(max(0.0, due - now))
+        if (failure := interaction.get("x")) == "timeout":
+            raise asyncio.TimeoutError
+        if failure is not None:
+            raise aiohttp.ClientConnectionError(f"Recorded {failure}")
+        return _ReplayResponse(interaction)
+
+    async def close(self) -> None:
+        """Nothing to close, for symmetry with aiohttp.ClientSession."""
@@ -0,0 +1,127 @@
+"""Command pipelines for V2C Cloud devices."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+_UNKNOWN = object()
+
+
+class DebouncedCommand:
+    """Collapse rapid calls of one command into its latest value.
+
+    Every submitted value restarts a `delay` second window, bounded by
+    `max_delay` since the first pending value. When the window closes only
+    the last value is sent and all pending callers get its result. A value
+    equal to `current()` is not sent at all, unless it differs from the last
+    value sent: the reported state lags behind sends not yet polled back.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Any], Awaitable[bool]],
+        delay: float,
+        max_delay: float,
+        current: Callable[[], Any] | None = None,
+    ) -> None:
+        """Initialize."""
+        self._send = send
+        self._delay = delay
+        self._max_delay = max_delay
+        self._current = current
+        self._lock = asyncio.Lock()
+        self._value: Any = None
+        self._waiters: list[asyncio.Future[bool]] = []
+        self._first_submit = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        # None until a value is sent, _UNKNOWN after a failed send
+        self._last_sent: Any = None
+
+        self.submitted = 0
+        self.sent = 0
+        self.collapsed = 0
+        self.skipped = 0
+
+    async def submit(self, value: Any) -> bool:
+        """Queue `value` and return the result of the command that carries it."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self.submitted += 1
+
+        if not self._waiters:
+            self._first_submit = now
+        elif self._timer is not None:
+            self._timer.cancel()
+
+        self._value = value
+        future: asyncio.Future[bool] = loop.create_future()
+        self._waiters.append(future)
+
+        fire_in = min(self._delay, self._first_submit + self._max_delay - now)
+        self._timer = loop.call_later(max(0.0, fire_in), self._fire)
+
+        return await future
+
+    def _fire(self) -> None:
+        """Close the window and send the latest value."""
+        self._timer = None
+        waiters, self._waiters = self._waiters, []
+        self.collapsed += len(waiters) - 1
+        task = asyncio.create_task(self._run(self._value, waiters))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, value: Any, waiters: list[asyncio.Future[bool]]) -> None:
+        """Send one coalesced value and resolve its callers."""
+        # Serialized so an older value can never land after a newer one
+        async with self._lock:
+            try:
+                if (
+                    self._current is not None
+                    and self._last_sent in (None, value)
+                    and self._current() == value
+                ):
+                    self.skipped += 1
+                    result = True
+                else:
+                    self.sent += 1
+                    self._last_sent = _UNKNOWN
+                    result = await self._send(value)
+                    if result:
+                        self._last_sent = value
+            except asyncio.CancelledError:
+                for waiter in waiters:
+                    waiter.cancel()
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(err)
+                return
+
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+
+    def cancel(self) -> None:
+        """Drop the pending value without sending it, and stop any send."""
+        for task in self._tasks:
+            task.cancel()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            waiter.cancel()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return how many calls were submitted, sent, collapsed and skipped."""
+        return {
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "collapsed": self.collapsed,
+            "skipped": self.skipped,
+        }
@@ -1,6 +1,7 @@
 """Config flow for V2C Cloud integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -15,16 +16,51 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .const import (
     DOMAIN,
     CONF_API_TOKEN,
+    CONF_CONNECTION_TIMEOUT,
+    CONF_DEDICATED_SESSION,
     CONF_DEVICE_ID,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_OPENMETRICS,
+    CONF_RECORD_CASSETTE,
     CONF_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_STALE_MAX_AGE,
+    CONF_STALE_MAX_FAILURES,
+    DEFAULT_FAST_SCAN_INTERVAL,
     DEFAULT_NAME,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
+    DEFAULT_STALE_MAX_AGE,
+    DEFAULT_STALE_MAX_FAILURES,
+    DEFAULT_TIMEOUT,
+)
+from .exceptions import (
+    V2CCloudAuthError,
+    V2CCloudError,
+    V2CCloudNotFoundError,
+    V2CCloudRateLimitError,
+    V2CCloudTransientError,
 )
 from .v2c_api import V2CCloudAPI
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _error_key(err: V2CCloudError) -> str:
+    """Return the form error shown for an API error."""
+    if isinstance(err, V2CCloudAuthError):
+        return "invalid_auth"
+    if isinstance(err, V2CCloudNotFoundError):
+        return "invalid_device"
+    if isinstance(err, V2CCloudRateLimitError):
+        return "rate_limit"
+    if isinstance(err.__cause__, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(err, V2CCloudTransientError):
+        return "cannot_connect"
+    return "unknown"
+
+
 class V2CCloudConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for V2C Cloud."""
 
@@ -64,6 +100,8 @@ class V2CCloudConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         data=user_input,
                     )
                     
+            except V2CCloudError as err:
+                errors["base"] = _error_key(err)
             except ConnectionError:
                 errors["base"] = "cannot_connect"
             except TimeoutError:
@@ -127,6 +165,8 @@ class V2CCloudConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 else:
                     errors["base"] = "invalid_auth"
                     
+            except V2CCloudError as err:
+                errors["base"] = _error_key(err)
             except Exception as ex:
                 _LOGGER.exception("Reauth exception: %s", ex)
                 errors["base"] = "unknown"
@@ -157,8 +197,15 @@ class V2CCloudOptionsFlowHandler(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if (
+                user_input[CONF_FAST_SCAN_INTERVAL]
+                <= user_input[CONF_SCAN_INTERVAL]
+                <= user_input[CONF_SLOW_SCAN_INTERVAL]
+            ):
+                return self.async_create_entry(title="", data=user_input)
+            errors["base"] = "intervals_out_of_order"
 
         options_schema = vol.Schema(
             {
@@ -168,6 +215,30 @@ class V2CCloudOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     ),
                 ): vol.All(vol.Coerce(int), vol.Range(min=30, max=300)),
+                vol.Optional(
+                    CONF_FAST_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=60)),
+                vol.Optional(
+                    CONF_SLOW_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=1800)),
+                vol.Optional(
+                    CONF_STALE_MAX_FAILURES,
+                    default=self.config_entry.options.get(
+                        CONF_STALE_MAX_FAILURES, DEFAULT_STALE_MAX_FAILURES
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+                vol.Optional(
+                    CONF_STALE_MAX_AGE,
+                    default=self.config_entry.options.get(
+                        CONF_STALE_MAX_AGE, DEFAULT_STALE_MAX_AGE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=3600)),
                 vol.Optional(
                     "enable_debug",
                     default=self.config_entry.options.get("enable_debug", False),
@@ -177,13 +248,37 @@ class V2CCloudOptionsFlowHandler(config_entries.OptionsFlow):
                     default=self.config_entry.options.get("power_detection_threshold", 100),
                 ): vol.All(vol.Coerce(int), vol.Range(min=50, max=1000)),
                 vol.Optional(
-                    "connection_timeout",
-                    default=self.config_entry.options.get("connection_timeout", 10),
+                    CONF_CONNECTION_TIMEOUT,
+                    default=self.config_entry.options.get(
+                        CONF_CONNECTION_TIMEOUT, DEFAULT_TIMEOUT
+                    ),
                 ): vol.All(vol.Coerce(int), vol.Range(min=5, max=30)),
+                vol.Optional(
+                    CONF_DEDICATED_SESSION,
+                    default=self.config_entry.options.get(
+                        CONF_DEDICATED_SESSION, False
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_RECORD_CASSETTE,
+                    default=self.config_entry.options.get(
+                        CONF_RECORD_CASSETTE, False
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_OPENMETRICS,
+                    default=self.config_entry.options.get(CONF_OPENMETRICS, False),
+                ): bool,
             }
         )
 
+        if user_input is not None:
+            options_schema = self.add_suggested_values_to_schema(
+                options_schema, user_input
+            )
+
         return self.async_show_form(
             step_id="init",
             data_schema=options_schema,
+            errors=errors,
         )
\ No newline at end of file
@@ -6,17 +6,95 @@ DOMAIN = "v2c_cloud"
 CONF_API_TOKEN = "api_token"
 CONF_DEVICE_ID = "device_id"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+CONF_SLOW_SCAN_INTERVAL = "slow_scan_interval"
+CONF_STALE_MAX_FAILURES = "stale_max_failures"
+CONF_STALE_MAX_AGE = "stale_max_age"
+CONF_CONNECTION_TIMEOUT = "connection_timeout"
+CONF_DEDICATED_SESSION = "dedicated_session"
+CONF_RECORD_CASSETTE = "record_cassette"
+CONF_OPENMETRICS = "openmetrics"
 
 # Defaults
 DEFAULT_NAME = "V2C Cloud"
-DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_SCAN_INTERVAL = 30  # connected but not charging
+DEFAULT_FAST_SCAN_INTERVAL = 10  # charging, and right after a command
+DEFAULT_SLOW_SCAN_INTERVAL = 300  # cable disconnected
+COMMAND_BURST_DURATION = 60
+# After failed polls the last snapshot is shown, marked stale, until this
+# many polls in a row failed or it is this many seconds old
+DEFAULT_STALE_MAX_FAILURES = 3
+DEFAULT_STALE_MAX_AGE = 900
 DEFAULT_TIMEOUT = 10
 
 # API Configuration - Kong Gateway endpoints
 # API_BASE_URL = "https://v2c.cloud/kong/v2c_service"
 API_BASE_URL = "https://v2c.cloud/api/v1"
 API_TIMEOUT = 10
+API_CONNECT_TIMEOUT = 5  # capped by the connection_timeout option
 API_RETRIES = 3
+API_RETRY_BACKOFF_BASE = 1.0
+API_RETRY_BACKOFF_MAX = 30
+API_CIRCUIT_FAILURE_THRESHOLD = 5
+API_CIRCUIT_RESET_TIMEOUT = 60
+
+# Request shaping - shared by every client using the same API token
+API_RATE_LIMIT = 1.0  # requests per second
+API_RATE_BURST = 5
+API_MAX_QUEUE = 20
+API_RESULT_REUSE_WINDOW = 2.0  # seconds a GET result is shared with later callers
+
+# Intensity changes within this window are collapsed into the last one
+COMMAND_DEBOUNCE_DELAY = 0.5
+COMMAND_DEBOUNCE_MAX_DELAY = 2.0
+
+# Commands update entities right away, a poll this many seconds later
+# confirms the device applied them
+OPTIMISTIC_VERIFY_DELAY = 5
+
+# Slow-changing fields, fetched on a long TTL or after a reboot instead of
+# on every poll
+METADATA_FIELDS = ("firmware_version", "max_intensity", "min_intensity")
+METADATA_TTL = 6 * 3600
+
+# Fleet polling - one scheduler per API token
+DATA_ACCOUNTS = "accounts"
+FLEET_MAX_CONCURRENCY = 4
+POLL_DUE_TOLERANCE = 1  # devices due within this many seconds share a cycle
+
+# Optional HTTP session of our own. Idle connections outlive the poll
+# interval so polls do not pay a new TLS handshake, and there is one
+# connection per concurrent fleet poll plus one for commands.
+DEDICATED_KEEPALIVE_TIMEOUT = 75
+DEDICATED_DNS_CACHE_TTL = 300
+DEDICATED_CONNECTIONS_PER_HOST = FLEET_MAX_CONCURRENCY + 1
+
+# Recorded API traffic, see cassette.py. Cassettes go to
+# <config>/v2c_cloud/cassettes/<device id>-<start time>.jsonl.gz
+CASSETTE_DIR = "cassettes"
+CASSETTE_FLUSH_SIZE = 50  # interactions buffered before they are written
+
+# Recent requests kept per charger for the diagnostics download
+HISTORY_PAYLOADS = 10  # raw /device/reported bodies
+HISTORY_EVENTS = 50  # request attempts, parse outcomes and commands
+
+# v2c_cloud.profile service, see profiler.py
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+ATTR_CPROFILE = "cprofile"
+ATTR_TIMEOUT = "timeout"
+DATA_PROFILER = "profiler"
+PROFILE_DEFAULT_CYCLES = 10
+PROFILE_DEFAULT_TIMEOUT = 1800  # report what was recorded by then
+
+# Optional OpenMetrics export of the chargers, see openmetrics.py
+DATA_OPENMETRICS = "openmetrics"
+OPENMETRICS_URL = "/api/v2c_cloud/metrics"
+
+# Last known device state, restored at startup so boot does not wait on the cloud
+STORAGE_KEY = DOMAIN
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
 
 # Device States
 CHARGE_STATES = {
@@ -28,12 +106,23 @@ CHARGE_STATES = {
     99: "unknown"
 }
 
+# "source_fields" lists the coordinator fields an entity's state and
+# attributes are built from, the entity is only written when one changes.
+# "static_attributes" never change, they are shared by every update and
+# left out of the recorder.
+
 # CRITICAL: Entity names that match EMHASS integration expectations
 SENSOR_TYPES = {
     "charge_power": {
         "key": "charge_power",
         "translation_key": "charge_power",
+        "source_fields": ("charge_power", "intensity", "voltage"),
         "icon": "mdi:flash",
+        "static_attributes": {
+            "max_power": 7400,  # V2C Trydan max power (32A * 230V)
+            "min_power": 1380,  # 6A * 230V
+            "efficiency": "95%",  # Typical EV charger efficiency
+        },
         "device_class": "power",
         "unit": "W",
         "state_class": "measurement",
@@ -41,6 +130,7 @@ SENSOR_TYPES = {
     "charge_energy": {
         "key": "charge_energy",
         "translation_key": "charge_energy",
+        "source_fields": ("charge_energy",),
         "icon": "mdi:battery-charging",
         "device_class": "energy",
         "unit": "kWh",
@@ -49,6 +139,7 @@ SENSOR_TYPES = {
     "charge_state": {
         "key": "charge_state",
         "translation_key": "charge_state",
+        "source_fields": ("charge_state", "last_updated", "stale", "data_age_seconds"),
         "icon": "mdi:ev-station",
         "device_class": None,
         "unit": None,
@@ -57,6 +148,7 @@ SENSOR_TYPES = {
     "charge_current": {
         "key": "charge_current",
         "translation_key": "charge_current",
+        "source_fields": ("charge_current", "intensity", "max_intensity", "min_intensity"),
         "icon": "mdi:current-ac",
         "device_class": "current", 
         "unit": "A",
@@ -65,6 +157,7 @@ SENSOR_TYPES = {
     "voltage": {
         "key": "voltage",
         "translation_key": "voltage",
+        "source_fields": ("voltage",),
         "icon": "mdi:sine-wave",
         "device_class": "voltage",
         "unit": "V", 
@@ -73,6 +166,7 @@ SENSOR_TYPES = {
     "temperature": {
         "key": "temperature",
         "translation_key": "temperature",
+        "source_fields": ("temperature",),
         "icon": "mdi:thermometer",
         "device_class": "temperature",
         "unit": "°C",
@@ -81,6 +175,7 @@ SENSOR_TYPES = {
     "session_energy": {
         "key": "session_energy",
         "translation_key": "session_energy",
+        "source_fields": ("session_energy",),
         "icon": "mdi:battery-plus",
         "device_class": "energy",
         "unit": "kWh",
@@ -89,6 +184,7 @@ SENSOR_TYPES = {
     "session_time": {
         "key": "session_time",
         "translation_key": "session_time",
+        "source_fields": ("session_time",),
         "icon": "mdi:timer",
         "device_class": "duration",
         "unit": "min",
@@ -97,6 +193,7 @@ SENSOR_TYPES = {
     "total_energy": {
         "key": "total_energy",
         "translation_key": "total_energy",
+        "source_fields": ("total_energy",),
         "icon": "mdi:counter",
         "device_class": "energy",
         "unit": "kWh",
@@ -105,6 +202,7 @@ SENSOR_TYPES = {
     "wifi_signal": {
         "key": "wifi_signal",
         "translation_key": "wifi_signal",
+        "source_fields": ("wifi_signal",),
         "icon": "mdi:wifi",
         "device_class": "signal_strength",
         "unit": "dBm",
@@ -113,6 +211,7 @@ SENSOR_TYPES = {
     "firmware_version": {
         "key": "firmware_version",
         "translation_key": "firmware_version",
+        "source_fields": ("firmware_version",),
         "icon": "mdi:chip",
         "device_class": None,
         "unit": None,
@@ -120,22 +219,72 @@ SENSOR_TYPES = {
     }
 }
 
+# Diagnostic sensors on the API client metrics, disabled by default. The
+# coordinator only reports "api_metrics" changes while one is enabled.
+API_SENSOR_TYPES = {
+    "api_latency": {
+        "key": "api_latency",
+        "translation_key": "api_latency",
+        "source_fields": ("api_metrics",),
+        "icon": "mdi:timer-outline",
+        "device_class": "duration",
+        "unit": "ms",
+        "state_class": "measurement",
+    },
+    "api_requests": {
+        "key": "api_requests",
+        "translation_key": "api_requests",
+        "source_fields": ("api_metrics",),
+        "icon": "mdi:cloud-sync",
+        "device_class": None,
+        "unit": None,
+        "state_class": "total_increasing",
+    },
+    "api_errors": {
+        "key": "api_errors",
+        "translation_key": "api_errors",
+        "source_fields": ("api_metrics",),
+        "icon": "mdi:cloud-alert",
+        "device_class": None,
+        "unit": None,
+        "state_class": "total_increasing",
+    },
+}
+# The endpoint whose latency is the state of api_latency, polled the most
+API_LATENCY_ENDPOINT = "/device/reported"
+
 # CRITICAL: Switch names that match EMHASS integration expectations
 SWITCH_TYPES = {
     "dynamic": {
         "key": "dynamic",
         "translation_key": "dynamic_power",
+        "source_fields": ("dynamic_power",),
         "icon": "mdi:auto-fix",
+        "static_attributes": {
+            "description": "Enables automatic power adjustment based on available solar power",
+            "requires_solar": True,
+            "compatible_with_emhass": True,
+        },
     },
     "paused": {
         "key": "paused",
         "translation_key": "paused",
+        "source_fields": ("paused", "charge_state"),
         "icon": "mdi:pause",
+        "static_attributes": {
+            "description": "Temporarily pauses charging without disconnecting",
+        },
     },
     "locked": {
         "key": "locked",
         "translation_key": "locked",
+        "source_fields": ("locked",),
         "icon": "mdi:lock",
+        "static_attributes": {
+            "description": "Prevents unauthorized use of the charger",
+            "security_feature": True,
+            "requires_unlock_to_charge": True,
+        },
     }
 }
 
@@ -144,7 +293,14 @@ NUMBER_TYPES = {
     "intensity": {
         "key": "intensity",
         "translation_key": "intensity",
+        "source_fields": ("intensity", "voltage"),
         "icon": "mdi:current-ac",
+        "static_attributes": {
+            "power_factor": "1.0",  # Assume unity power factor for EV charging
+            "charging_phases": 1,  # V2C Trydan is typically single-phase
+            "emhass_compatible": True,
+            "description": "Primary control for EMHASS optimization",
+        },
         "min_value": 6,
         "max_value": 32,
         "step": 1,
@@ -154,7 +310,13 @@ NUMBER_TYPES = {
     "max_intensity": {
         "key": "max_intensity",
         "translation_key": "max_intensity",
+        "source_fields": ("max_intensity",),
         "icon": "mdi:speedometer",
+        "static_attributes": {
+            "description": "Maximum allowed charging current (hardware/installation limit)",
+            "configured_by": "installer_or_device_settings",
+            "safety_limit": True,
+        },
         "min_value": 6,
         "max_value": 32,
         "step": 1,
@@ -164,7 +326,13 @@ NUMBER_TYPES = {
     "min_intensity": {
         "key": "min_intensity",
         "translation_key": "min_intensity",
+        "source_fields": ("min_intensity",),
         "icon": "mdi:speedometer-slow",
+        "static_attributes": {
+            "description": "Minimum charging current (technical minimum for stable charging)",
+            "iec_standard": "6A minimum per IEC 61851",
+            "technical_limit": True,
+        },
         "min_value": 6,
         "max_value": 32,
         "step": 1,
@@ -178,21 +346,45 @@ BUTTON_TYPES = {
     "start_charge": {
         "key": "start_charge",
         "translation_key": "start_charge",
+        "source_fields": ("charge_state",),
         "icon": "mdi:play",
+        "static_attributes": {
+            "description": "Start EV charging session",
+            "requires_cable_connected": True,
+            "emhass_controlled": True,
+        },
     },
     "stop_charge": {
         "key": "stop_charge",
         "translation_key": "stop_charge",
+        "source_fields": ("charge_state",),
         "icon": "mdi:stop",
+        "static_attributes": {
+            "description": "Stop current EV charging session",
+            "preserves_connection": True,
+            "emhass_controlled": True,
+        },
     },
     "restart_device": {
         "key": "restart_device",
         "translation_key": "restart_device",
+        "source_fields": (),
         "icon": "mdi:restart",
+        "static_attributes": {
+            "description": "Restart the V2C Trydan device",
+            "warning": "Will temporarily interrupt charging if active",
+            "use_case": "troubleshooting_connectivity_issues",
+            "restart_duration": "30-60 seconds",
+        },
     },
     "reset_session": {
         "key": "reset_session",
         "translation_key": "reset_session",
+        "source_fields": ("session_energy", "session_time"),
         "icon": "mdi:counter",
+        "static_attributes": {
+            "description": "Reset current charging session counters",
+            "resets_counters": ["session_energy", "session_time"],
+        },
     }
 }
\ No newline at end of file
@@ -0,0 +1,801 @@
+"""Data update coordinators for V2C Cloud integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any
+
+import aiohttp
+
+from homeassistant.config_entries import current_entry
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    DOMAIN,
+    API_MAX_QUEUE,
+    API_RATE_BURST,
+    API_RATE_LIMIT,
+    API_RESULT_REUSE_WINDOW,
+    COMMAND_DEBOUNCE_DELAY,
+    COMMAND_DEBOUNCE_MAX_DELAY,
+    DATA_PROFILER,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_MAX_AGE,
+    DEFAULT_STALE_MAX_FAILURES,
+    FLEET_MAX_CONCURRENCY,
+    METADATA_TTL,
+    OPTIMISTIC_VERIFY_DELAY,
+    POLL_DUE_TOLERANCE,
+    STORAGE_SAVE_DELAY,
+)
+from .cassette import CassetteRecorder
+from .commands import DebouncedCommand
+from .exceptions import (
+    V2CCloudAuthError,
+    V2CCloudError,
+    V2CCloudMalformedResponseError,
+    V2CCloudNotFoundError,
+    V2CCloudRateLimitError,
+)
+from .polling import AdaptivePollPolicy, StalenessBudget
+from .profiler import STAGE_DIFF, STAGE_ENTITY_VALUES, STAGE_STATE_WRITES, CycleProfiler
+from .scheduler import PRIORITY_POLL, PRIORITY_REFRESH, RequestScheduler
+from .session import ConnectionStats
+from .singleflight import SingleFlight
+from .status import LIVE_FIELDS, V2CStatus
+from .v2c_api import V2CCloudAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors after which the last snapshot is still the best known state
+STALE_DATA_ERRORS = (V2CCloudRateLimitError, V2CCloudMalformedResponseError)
+
+
+class V2CCloudAccountCoordinator(DataUpdateCoordinator):
+    """Poll every charger configured for one API token from a single scheduler.
+
+    Device coordinators register here instead of running their own timers.
+    Each device decides when it is next due (see AdaptivePollPolicy). A cycle
+    fetches the status of every due device with bounded concurrency, the
+    device coordinators publish their own slice and the account sleeps until
+    the next device is due.
+
+    A rejected token stops the fleet poll until a device registers again,
+    which happens when its entry is set up again after reauth.
+
+    The account is shared by the entries of its token and belongs to none
+    of them, async_unload_entry shuts it down with its last charger.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        api_token: str,
+        max_concurrency: int = FLEET_MAX_CONCURRENCY,
+        connection_stats: ConnectionStats | None = None,
+    ) -> None:
+        """Initialize.
+
+        `connection_stats` is given when `session` was created for this
+        account by async_create_session, the account then closes it.
+        """
+        self._session = session
+        self.connection_stats = connection_stats
+        self._unsub_close: CALLBACK_TYPE | None = None
+        if connection_stats is not None:
+            self._unsub_close = hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_CLOSE, self._async_close_session
+            )
+        self._api_token = api_token
+        self._max_concurrency = max_concurrency
+        self._devices: dict[str, V2CCloudDataUpdateCoordinator] = {}
+        self._remove_listeners: dict[str, CALLBACK_TYPE] = {}
+        self._polled: set[str] = set()
+        self._errors: dict[str, Exception] = {}
+        self.auth_failed = False
+        self.scheduler = RequestScheduler(
+            rate=API_RATE_LIMIT, burst=API_RATE_BURST, max_queue=API_MAX_QUEUE
+        )
+        self.single_flight = SingleFlight(API_RESULT_REUSE_WINDOW)
+        self.pairings: dict[str, dict[str, Any]] | None = None
+        self._pairings_expires = 0.0
+        # Picked up from hass.data when a cycle starts, see profiler.py
+        self.profiler: CycleProfiler | None = None
+        self._cycle_started = 0.0
+        # Created while the first entry of the token is set up, which would
+        # otherwise shut the account down whenever that entry is unloaded
+        entry_token = current_entry.set(None)
+        try:
+            super().__init__(
+                hass,
+                _LOGGER,
+                name=f"{DOMAIN}_account",
+                update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            )
+        finally:
+            current_entry.reset(entry_token)
+
+    @property
+    def device_count(self) -> int:
+        """Return the number of chargers polled by this account."""
+        return len(self._devices)
+
+    def create_api(
+        self,
+        device_id: str,
+        timeout: float,
+        recorder: CassetteRecorder | None = None,
+    ) -> V2CCloudAPI:
+        """Create an API client for one charger on this account."""
+        return V2CCloudAPI(
+            session=self._session,
+            api_token=self._api_token,
+            device_id=device_id,
+            scheduler=self.scheduler,
+            single_flight=self.single_flight,
+            timeout=timeout,
+            recorder=recorder,
+        )
+
+    async def _async_close_session(self, _event: Event | None = None) -> None:
+        """Close the session dedicated to this account."""
+        self._unsub_close = None
+        await self._session.close()
+
+    async def async_shutdown(self) -> None:
+        """Shut down, stop shared calls and close a dedicated session."""
+        await super().async_shutdown()
+        self.single_flight.cancel()
+        if self._unsub_close is not None:
+            self._unsub_close()
+            await self._async_close_session()
+
+    async def async_discover(self, api: V2CCloudAPI) -> None:
+        """Discover the chargers paired to this token, again after METADATA_TTL."""
+        if self.pairings is not None and time.monotonic() < self._pairings_expires:
+            return
+
+        try:
+            pairings = await api.get_pairings()
+        except V2CCloudAuthError:
+            raise
+        except V2CCloudError as err:
+            _LOGGER.debug("Could not list pairings, will retry on next poll: %s", err)
+            return
+
+        self.pairings = {
+            device["deviceId"]: device for device in pairings if "deviceId" in device
+        }
+        self._pairings_expires = time.monotonic() + METADATA_TTL
+        _LOGGER.debug("Discovered %s paired chargers", len(self.pairings))
+
+        for device_id in self._devices.keys() - self.pairings.keys():
+            _LOGGER.warning(
+                "Device %s is not listed in the pairings of its API token", device_id
+            )
+
+    @callback
+    def async_register(
+        self, coordinator: V2CCloudDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Add a charger to the fleet poll and return the unregister callback.
+
+        Pairings are discovered by the next fleet poll, registering never
+        waits on the cloud.
+        """
+        device_id = coordinator.api.device_id
+        self._devices[device_id] = coordinator
+        coordinator.api.profiler = self.profiler
+        self.auth_failed = False
+        self.async_reschedule()
+        self._remove_listeners[device_id] = self.async_add_listener(
+            partial(self._async_publish, coordinator)
+        )
+        return partial(self.async_unregister, coordinator)
+
+    @callback
+    def async_unregister(self, coordinator: V2CCloudDataUpdateCoordinator) -> None:
+        """Remove a charger from the fleet poll, again is a no-op."""
+        device_id = coordinator.api.device_id
+        if self._devices.get(device_id) is not coordinator:
+            return
+        del self._devices[device_id]
+        self._remove_listeners.pop(device_id)()
+        self.async_reschedule()
+
+    @callback
+    def _async_publish(self, coordinator: V2CCloudDataUpdateCoordinator) -> None:
+        """Push one charger's slice of the latest fleet poll to its coordinator."""
+        if coordinator.api.device_id not in self._polled:
+            return
+        device_id = coordinator.api.device_id
+        status = self.data.get(device_id) if self.data else None
+        if (error := self._errors.get(device_id)) is not None:
+            coordinator.async_set_api_error(error)
+        elif not self.last_update_success or status is None:
+            coordinator.async_set_update_error(
+                UpdateFailed(f"No status received for {device_id}")
+            )
+        else:
+            coordinator.async_set_updated_data(status)
+
+    @callback
+    def async_reschedule(self) -> None:
+        """Wake up when the next registered charger is due for a poll."""
+        if not self._devices or self.auth_failed:
+            return
+        self._update_interval_from_devices()
+        if self._listeners:
+            self._schedule_refresh()
+
+    def _update_interval_from_devices(self) -> None:
+        """Set update_interval to the delay until the next charger is due."""
+        next_poll = min(device.next_poll for device in self._devices.values())
+        delay = max(POLL_DUE_TOLERANCE, next_poll - time.monotonic())
+        self.update_interval = timedelta(seconds=delay)
+
+    @callback
+    def _async_set_profiler(self, profiler: CycleProfiler | None) -> None:
+        """Start or stop timing the stages of this account's cycles."""
+        self.profiler = profiler
+        for device in self._devices.values():
+            device.api.profiler = profiler
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Run a cycle, profiled ones end once published or failed.
+
+        Repeated failures are not published, ending the cycle here keeps it
+        from running into the next one.
+        """
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            if self.profiler is not None and self._cycle_started:
+                self.profiler.end_cycle(time.perf_counter() - self._cycle_started)
+            self._cycle_started = 0.0
+
+    async def _async_update_data(self) -> dict[str, V2CStatus | None]:
+        """Fetch the status of every registered charger that is due."""
+        profiler = self.hass.data[DOMAIN].get(DATA_PROFILER)
+        if profiler is not self.profiler:
+            self._async_set_profiler(profiler)
+        if profiler is not None:
+            profiler.start_cycle()
+            self._cycle_started = time.perf_counter()
+
+        now = time.monotonic()
+        devices = [
+            device
+            for device in self._devices.values()
+            if device.next_poll <= now + POLL_DUE_TOLERANCE
+        ]
+        self._polled = {device.api.device_id for device in devices}
+        self._errors = {}
+        if devices:
+            try:
+                await self.async_discover(devices[0].api)
+            except V2CCloudAuthError as err:
+                self._async_stop_polling(err)
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def _fetch(device: V2CCloudDataUpdateCoordinator):
+            async with semaphore:
+                return await device.async_fetch_status(PRIORITY_POLL)
+
+        results = await asyncio.gather(
+            *(_fetch(device) for device in devices), return_exceptions=True
+        )
+
+        data: dict[str, V2CStatus | None] = dict(self.data or {})
+        for device, result in zip(devices, results):
+            if isinstance(result, V2CCloudAuthError):
+                self._async_stop_polling(result)
+            if isinstance(result, Exception):
+                _LOGGER.debug("Error fetching %s: %s", device.api.device_id, result)
+                self._errors[device.api.device_id] = result
+                device.schedule_retry(result)
+                result = None
+            else:
+                device.schedule_next_poll(result)
+            data[device.api.device_id] = result
+
+        # The base class schedules the next refresh from update_interval
+        # as soon as this returns
+        if self._devices:
+            self._update_interval_from_devices()
+
+        # Failed devices get their own error when the cycle is published,
+        # failing the cycle would skip publishing the next failed one
+        return data
+
+    def _async_stop_polling(self, err: V2CCloudAuthError) -> None:
+        """Stop polling with a rejected token and fail this cycle."""
+        if not self.auth_failed:
+            _LOGGER.warning("API token rejected, polling stopped until reauth: %s", err)
+        self.auth_failed = True
+        self.update_interval = None
+        self._polled = set(self._devices)
+        self._errors = dict.fromkeys(self._devices, err)
+        raise UpdateFailed(f"API token rejected: {err}") from err
+
+
+class V2CCloudDataUpdateCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching data from the V2C Cloud API."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: V2CCloudAPI,
+        poll_policy: AdaptivePollPolicy,
+        account: V2CCloudAccountCoordinator | None = None,
+        store: Store | None = None,
+        stale_budget: StalenessBudget | None = None,
+    ) -> None:
+        """Initialize."""
+        self.api = api
+        self.poll_policy = poll_policy
+        self.stale_budget = stale_budget or StalenessBudget(
+            DEFAULT_STALE_MAX_FAILURES, DEFAULT_STALE_MAX_AGE
+        )
+        self.next_poll = 0.0
+        self.consecutive_failures = 0
+        self.metadata: dict[str, Any] = {}
+        self._metadata_expires = 0.0
+        self._metadata_changes: set[str] = set()
+        self._account = account
+
+        # Last known state, see async_restore and data_available. `stale` is
+        # True while the snapshot was restored or the last poll failed.
+        self._store = store
+        self.stale = False
+        self.data_updated_at: float | None = None
+
+        # Change tracking, see async_update_listeners
+        self.changed_fields: frozenset[str] = frozenset()
+        self.data_version = 0
+        self._notified_data: V2CStatus | None = None
+        self._notified_success: bool | None = None
+        self._notified_stale = False
+        self._notified_available: bool | None = None
+        # Enabled API metric sensors, see async_track_api_metrics
+        self._api_metrics_entities = 0
+        self._notified_api_requests = 0
+        self.updates_skipped = 0
+        self.writes_emitted = 0
+        self.writes_suppressed = 0
+        self.views_computed = 0
+        self.views_reused = 0
+        self.view_seconds = 0.0
+
+        # Optimistic commands: `reported_data` is the last snapshot from the
+        # device, `data` is that snapshot with pending commanded values on top
+        self.reported_data: V2CStatus | None = None
+        self._expected: dict[str, Any] = {}
+        self._sent: dict[str, Any] = {}
+        self._unsub_verify: CALLBACK_TYPE | None = None
+
+        self.intensity_command = DebouncedCommand(
+            self._async_send_intensity,
+            delay=COMMAND_DEBOUNCE_DELAY,
+            max_delay=COMMAND_DEBOUNCE_MAX_DELAY,
+            current=lambda: (
+                self.reported_data.intensity if self.reported_data else None
+            ),
+        )
+        # Periodic polling is driven by the account coordinator, this one only
+        # refreshes on demand (first refresh and after commands).
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=None,
+        )
+
+    async def _async_update_data(self):
+        """Update data via library."""
+        try:
+            status = await self.async_fetch_status(PRIORITY_REFRESH)
+        except V2CCloudAuthError as err:
+            raise ConfigEntryAuthFailed(err) from err
+        except Exception as exception:
+            self.schedule_retry(exception)
+            if self._account is not None:
+                self._account.async_reschedule()
+            if self.reported_data is not None:
+                self.stale = True
+            if self._keeps_data(exception):
+                return self._with_expected(self.reported_data)
+            raise UpdateFailed(exception) from exception
+
+        self.schedule_next_poll(status)
+        if self._account is not None:
+            self._account.async_reschedule()
+        self.reported_data = status
+        self.stale = False
+        self.data_updated_at = time.time()
+        return self._with_expected(status)
+
+    @callback
+    def async_set_updated_data(self, data: V2CStatus | None) -> None:
+        """Publish a device snapshot, keeping pending commanded values."""
+        self.reported_data = data
+        self.stale = False
+        self.data_updated_at = time.time()
+        super().async_set_updated_data(self._with_expected(data))
+
+    @callback
+    def async_set_update_error(self, err: Exception) -> None:
+        """Record a failed poll, keeping the last snapshot as stale data.
+
+        Unlike the base class every failure is passed on to the listeners,
+        the snapshot keeps ageing and may run out of its staleness budget.
+        """
+        if self.reported_data is not None:
+            self.stale = True
+        if self.last_update_success:
+            super().async_set_update_error(err)
+        else:
+            self.last_exception = err
+            self.async_update_listeners()
+
+    @callback
+    def async_set_api_error(self, err: Exception) -> None:
+        """Publish a failed fleet poll the way its error calls for.
+
+        A rejected token starts reauth, a throttled or garbled answer keeps
+        the last snapshot as stale data and anything else is an update error.
+        """
+        if self._keeps_data(err):
+            self.stale = True
+            self.async_update_listeners()
+            return
+        if isinstance(err, V2CCloudAuthError) and self.config_entry is not None:
+            self.config_entry.async_start_reauth(self.hass)
+        self.async_set_update_error(err)
+
+    def _keeps_data(self, err: Exception) -> bool:
+        """Return True if the last snapshot outlives this error."""
+        return isinstance(err, STALE_DATA_ERRORS) and self.reported_data is not None
+
+    @callback
+    def _async_republish(self) -> None:
+        """Publish the last snapshot again after the commanded values changed.
+
+        Only the data changes: the success flag and the poll schedule stay
+        as the last poll left them.
+        """
+        if self.reported_data is not None:
+            self.data = self._with_expected(self.reported_data)
+            self.async_update_listeners()
+
+    async def async_restore(self) -> bool:
+        """Load the last known snapshot from storage, return True if found.
+
+        The snapshot is marked stale and served until the first poll.
+        """
+        if self._store is None:
+            return False
+        cached = await self._store.async_load()
+        if not isinstance(cached, dict) or not isinstance(cached.get("data"), dict):
+            return False
+
+        self.reported_data = self.data = V2CStatus.from_dict(cached["data"])
+        self.metadata = cached.get("metadata") or {}
+        self.data_updated_at = cached.get("updated_at")
+        self.stale = True
+        _LOGGER.debug("Restored the last known state of %s", self.api.device_id)
+        return True
+
+    @callback
+    def _async_save(self) -> None:
+        """Save the last reported snapshot, batched by the store."""
+        if self._store is None or self.stale or self.reported_data is None:
+            return
+        cached = {
+            "data": self.reported_data._asdict(),
+            "metadata": self.metadata,
+            "updated_at": self.data_updated_at,
+        }
+        self._store.async_delay_save(lambda: cached, STORAGE_SAVE_DELAY)
+
+    @property
+    def data_age_seconds(self) -> float | None:
+        """Return how old the last snapshot from the device is."""
+        if self.data_updated_at is None:
+            return None
+        return max(0.0, time.time() - self.data_updated_at)
+
+    @property
+    def data_available(self) -> bool:
+        """Return True while the entities may show the current snapshot.
+
+        A stale snapshot is shown until the staleness budget is spent, while
+        the account keeps polling in the background. A rejected token ends
+        it right away, nothing will revalidate the snapshot.
+        """
+        if self.data is None:
+            return False
+        if not self.stale:
+            return True
+        if isinstance(self.last_exception, (ConfigEntryAuthFailed, V2CCloudAuthError)):
+            return False
+        return self.stale_budget.allows(
+            self.consecutive_failures, self.data_age_seconds
+        )
+
+    def _with_expected(self, status: V2CStatus | None) -> V2CStatus | None:
+        """Overlay the values of commands still awaiting verification."""
+        if not self._expected or status is None:
+            return status
+        # Values the device already reports need no overlay any more
+        self._expected = {
+            key: value
+            for key, value in self._expected.items()
+            if getattr(status, key) != value
+        }
+        if not self._expected:
+            return status
+        return status._replace(**self._expected)
+
+    @property
+    def metadata_due(self) -> bool:
+        """Return True when the slow-changing fields should be fetched again."""
+        return time.monotonic() >= self._metadata_expires
+
+    @callback
+    def invalidate_metadata(self) -> None:
+        """Fetch the slow-changing fields on the next poll, e.g. after a reboot."""
+        self._metadata_expires = 0.0
+
+    async def async_fetch_status(self, priority: int) -> V2CStatus:
+        """Fetch the status, and refresh the metadata when it is due.
+
+        Every poll makes the same /device/reported call and the snapshot
+        still carries the metadata fields it reports. Only the pairings
+        call and the update of `self.metadata`, which the entities read
+        metadata from, are tiered, once per METADATA_TTL.
+        """
+        status = await self.api.get_device_status(priority=priority)
+        if not self.metadata_due:
+            return status
+
+        metadata = status.metadata
+        if self._account is not None and self._account.pairings:
+            metadata["pairing"] = self._account.pairings.get(self.api.device_id)
+        self._metadata_changes.update(
+            key
+            for key in self.metadata.keys() | metadata.keys()
+            if self.metadata.get(key) != metadata.get(key)
+        )
+        self.metadata = metadata
+        self._metadata_expires = time.monotonic() + METADATA_TTL
+        return status
+
+    @callback
+    def async_track_api_metrics(self) -> CALLBACK_TYPE:
+        """Report "api_metrics" changes until the returned callback is called."""
+        self._api_metrics_entities += 1
+
+        @callback
+        def _untrack() -> None:
+            self._api_metrics_entities -= 1
+
+        return _untrack
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify entities, unless nothing they could show has changed.
+
+        `changed_fields` holds the fields that differ from the snapshot last
+        pushed to the entities, which use it to skip their own state write.
+        While stale the data age changes with every notification, and while
+        an API metric sensor is enabled so do the metrics after a request.
+        `data_version` goes up with every notified change.
+        """
+        profiler = self._account.profiler if self._account is not None else None
+        if profiler is not None:
+            started = time.perf_counter()
+        changed = _changed_fields(self._notified_data, self.data)
+        if profiler is not None:
+            profiler.add(STAGE_DIFF, time.perf_counter() - started)
+        if self._metadata_changes:
+            changed |= self._metadata_changes
+            self._metadata_changes = set()
+        if self.stale != self._notified_stale:
+            changed.add("stale")
+        if self.stale:
+            changed.add("data_age_seconds")
+        if (
+            self._api_metrics_entities
+            and self.api.metrics.requests != self._notified_api_requests
+        ):
+            changed.add("api_metrics")
+        available = self.data_available
+
+        if (
+            not changed
+            and self.last_update_success == self._notified_success
+            and available == self._notified_available
+        ):
+            self.updates_skipped += 1
+            return
+
+        self.changed_fields = frozenset(changed)
+        self._notified_data = self.data
+        self._notified_success = self.last_update_success
+        self._notified_stale = self.stale
+        self._notified_available = available
+        self._notified_api_requests = self.api.metrics.requests
+        self.data_version += 1
+        if profiler is None:
+            super().async_update_listeners()
+        else:
+            # Entities derive their values while writing their state
+            view_seconds = self.view_seconds
+            started = time.perf_counter()
+            super().async_update_listeners()
+            views = self.view_seconds - view_seconds
+            profiler.add(STAGE_ENTITY_VALUES, views)
+            profiler.add(STAGE_STATE_WRITES, time.perf_counter() - started - views)
+        self._async_save()
+
+    @property
+    def write_stats(self) -> dict[str, int]:
+        """Return how many state writes were emitted and suppressed."""
+        return {
+            "updates_skipped": self.updates_skipped,
+            "writes_emitted": self.writes_emitted,
+            "writes_suppressed": self.writes_suppressed,
+        }
+
+    @property
+    def view_stats(self) -> dict[str, float]:
+        """Return how often entity values were derived or served from cache.
+
+        `view_avg_us` is the cost of deriving one entity's value and
+        attributes for one update.
+        """
+        return {
+            "views_computed": self.views_computed,
+            "views_reused": self.views_reused,
+            "view_avg_us": round(
+                self.view_seconds / self.views_computed * 1e6, 1
+            ) if self.views_computed else 0.0,
+        }
+
+    def schedule_next_poll(self, status: V2CStatus) -> None:
+        """Set when the account should poll this charger next."""
+        self.consecutive_failures = 0
+        self.next_poll = time.monotonic() + self.poll_policy.interval(
+            status.charge_state
+        )
+
+    def schedule_retry(self, err: Exception) -> None:
+        """Set when to poll again after a failed poll.
+
+        Throttled polls wait at least the Retry-After delay, unknown devices
+        are polled at the slow rate and other failures back off exponentially
+        up to it.
+        """
+        self.consecutive_failures += 1
+        charge_state = self.data.charge_state if self.data else None
+        interval = self.poll_policy.interval(charge_state)
+        if isinstance(err, V2CCloudRateLimitError):
+            delay = max(interval, err.retry_after or 0)
+        elif isinstance(err, V2CCloudNotFoundError):
+            delay = self.poll_policy.slow
+        elif isinstance(err, V2CCloudMalformedResponseError):
+            delay = interval
+        else:
+            delay = min(
+                max(interval, self.poll_policy.slow),
+                interval * 2 ** (self.consecutive_failures - 1),
+            )
+        self.next_poll = time.monotonic() + delay
+
+    async def async_send_command(
+        self,
+        send: Callable[[], Awaitable[bool]],
+        expected: dict[str, Any] | None = None,
+    ) -> bool:
+        """Send a command and show its `expected` values right away.
+
+        The values are rolled back if the command fails. Otherwise a single
+        deferred poll, shared by commands sent in quick succession, checks
+        that the device reports them.
+        """
+        if expected:
+            self.async_set_optimistic(expected)
+
+        try:
+            success = await send()
+        except Exception:
+            self._async_rollback(expected)
+            raise
+
+        if not success:
+            self._async_rollback(expected)
+            return False
+
+        if expected:
+            self._sent.update(expected)
+        self.poll_policy.start_burst()
+        if self._unsub_verify is not None:
+            self._unsub_verify()
+        self._unsub_verify = async_call_later(
+            self.hass, OPTIMISTIC_VERIFY_DELAY, self._async_verify
+        )
+        return True
+
+    @callback
+    def async_set_optimistic(self, expected: dict[str, Any]) -> None:
+        """Show commanded values until the device confirms or a command fails."""
+        self._expected.update(expected)
+        self._async_republish()
+
+    @callback
+    def _async_rollback(self, expected: dict[str, Any] | None) -> None:
+        """Drop the optimistic values of a failed command."""
+        if not expected:
+            return
+        for key in expected:
+            self._expected.pop(key, None)
+            self._sent.pop(key, None)
+        self._async_republish()
+
+    async def _async_verify(self, _now: Any = None) -> None:
+        """Poll once and compare the device state with the commanded values."""
+        self._unsub_verify = None
+        # Values still waiting to be sent (e.g. debounced) stay optimistic
+        expected, self._sent = self._sent, {}
+        for key, value in expected.items():
+            if self._expected.get(key) == value:
+                del self._expected[key]
+        await self.async_refresh()
+
+        if not expected or self.reported_data is None:
+            return
+        for key, value in expected.items():
+            reported = getattr(self.reported_data, key)
+            if reported != value:
+                _LOGGER.warning(
+                    "Device %s reports %s=%s after a command that set %s, "
+                    "showing the reported value",
+                    self.api.device_id,
+                    key,
+                    reported,
+                    value,
+                )
+
+    async def _async_send_intensity(self, intensity: int) -> bool:
+        """Send a coalesced intensity."""
+        return await self.async_send_command(
+            partial(self.api.set_intensity, intensity), {"intensity": intensity}
+        )
+
+    async def async_shutdown(self) -> None:
+        """Drop pending commands and shut down."""
+        self.intensity_command.cancel()
+        if self._unsub_verify is not None:
+            self._unsub_verify()
+            self._unsub_verify = None
+        await super().async_shutdown()
+
+
+def _changed_fields(old: V2CStatus | None, new: V2CStatus | None) -> set[str]:
+    """Return the live fields whose values differ between two snapshots."""
+    if old is new:
+        return set()
+    if new is None:
+        return set(LIVE_FIELDS)
+    return new.changed_fields(old)
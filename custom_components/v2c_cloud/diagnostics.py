@@ -0,0 +1,59 @@
+"""Diagnostics support for V2C Cloud."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_TOKEN, DATA_ACCOUNTS, DOMAIN
+
+TO_REDACT = {CONF_API_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry, from memory only."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    token = entry.data[CONF_API_TOKEN]
+    account = hass.data[DOMAIN][DATA_ACCOUNTS].get(token)
+    age = coordinator.data_age_seconds
+    status = coordinator.reported_data
+
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "device": {
+            "status": status._asdict() if status is not None else None,
+            "metadata": coordinator.metadata,
+            "available": coordinator.data_available,
+            "stale": coordinator.stale,
+            "data_age_seconds": round(age, 1) if age is not None else None,
+            "consecutive_failures": coordinator.consecutive_failures,
+            "last_error": repr(coordinator.last_exception).replace(token, REDACTED)
+            if coordinator.last_exception
+            else None,
+            "next_poll_in_seconds": round(coordinator.next_poll - time.monotonic(), 1),
+            "writes": coordinator.write_stats,
+            "views": coordinator.view_stats,
+            "commands": coordinator.intensity_command.stats,
+        },
+        "api": coordinator.api.metrics.as_dict(),
+        "history": coordinator.api.history.as_dict(token),
+    }
+    if account is not None:
+        diagnostics["account"] = {
+            "devices": account.device_count,
+            "auth_failed": account.auth_failed,
+            "scheduler": account.scheduler.metrics,
+            "single_flight": account.single_flight.stats,
+            "connections": account.connection_stats.stats
+            if account.connection_stats is not None
+            else None,
+        }
+    return diagnostics
@@ -1,20 +1,109 @@
 """Base entity for V2C Cloud integration."""
 from __future__ import annotations
 
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any, NamedTuple
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 
 
+class DerivedView(NamedTuple):
+    """State value and attributes of an entity for one data version."""
+
+    value: Any
+    attributes: Mapping[str, Any] | None
+
+
 class V2CCloudEntity(CoordinatorEntity):
-    """Base V2C Cloud entity."""
+    """Base V2C Cloud entity.
 
-    def __init__(self, coordinator, entity_type: str):
-        """Initialize the entity."""
+    Platforms implement `_compute_value` and `_compute_attributes`. Both run
+    once per coordinator `data_version`, the state properties HA reads while
+    writing state return the cached result.
+    """
+
+    def __init__(
+        self,
+        coordinator,
+        entity_type: str,
+        source_fields: Iterable[str] | None = None,
+        static_attributes: Mapping[str, Any] | None = None,
+    ):
+        """Initialize the entity.
+
+        `source_fields` are the coordinator fields this entity is built from,
+        None means any change is relevant. `static_attributes` are added to
+        the derived ones, the platform lists them in _unrecorded_attributes.
+        """
         super().__init__(coordinator)
         self._type = entity_type
         self._attr_unique_id = f"{coordinator.api._device_id}_{entity_type}"
+        self._source_fields = frozenset(source_fields) if source_fields is not None else None
+        self._static_attributes = static_attributes
+        self._written_available: bool | None = None
+        self._view: DerivedView | None = None
+        self._view_version = -1
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the availability written when the entity was added."""
+        await super().async_added_to_hass()
+        self._written_available = self.available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if availability or one of our fields changed."""
+        available = self.available
+        if available == self._written_available and (
+            self._source_fields is not None
+            and self._source_fields.isdisjoint(self.coordinator.changed_fields)
+        ):
+            self.coordinator.writes_suppressed += 1
+            return
+        self._written_available = available
+        self.coordinator.writes_emitted += 1
+        super()._handle_coordinator_update()
+
+    def _compute_value(self) -> Any:
+        """Return the state value derived from the coordinator data."""
+        return None
+
+    def _compute_attributes(self) -> dict[str, Any] | None:
+        """Return the attributes derived from the coordinator data."""
+        return None
+
+    def _merge_attributes(self) -> Mapping[str, Any] | None:
+        """Return the static attributes with the derived ones on top."""
+        attributes = self._compute_attributes()
+        if not self._static_attributes:
+            return attributes
+        if not attributes:
+            # Shared as is, HA copies attributes into the state
+            return self._static_attributes
+        return {**self._static_attributes, **attributes}
+
+    @property
+    def _derived(self) -> DerivedView:
+        """Return the value and attributes of the current data version."""
+        coordinator = self.coordinator
+        if self._view is None or self._view_version != coordinator.data_version:
+            start = time.perf_counter()
+            self._view = DerivedView(self._compute_value(), self._merge_attributes())
+            self._view_version = coordinator.data_version
+            coordinator.views_computed += 1
+            coordinator.view_seconds += time.perf_counter() - start
+        else:
+            coordinator.views_reused += 1
+        return self._view
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the derived attributes."""
+        return self._derived.attributes
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -24,11 +113,12 @@ class V2CCloudEntity(CoordinatorEntity):
             name="V2C Trydan",
             manufacturer="V2C",
             model="Trydan",
-            sw_version=self.coordinator.data.get("firmware_version", "Unknown") if self.coordinator.data else "Unknown",
+            sw_version=self.coordinator.metadata.get("firmware_version", "Unknown"),
             configuration_url="https://v2c.cloud",
         )
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self.coordinator.last_update_success and self.coordinator.data is not None
\ No newline at end of file
+        # Stale snapshots are served within their budget, see data_available
+        return self.coordinator.data_available
\ No newline at end of file
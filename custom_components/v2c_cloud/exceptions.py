@@ -0,0 +1,38 @@
+"""Errors raised by the V2C Cloud API client."""
+from __future__ import annotations
+
+
+class V2CCloudError(Exception):
+    """Base class for V2C Cloud API errors."""
+
+
+class V2CCloudAuthError(V2CCloudError):
+    """The API token was rejected (401/403)."""
+
+
+class V2CCloudNotFoundError(V2CCloudError):
+    """The device or endpoint does not exist (404)."""
+
+
+class V2CCloudRateLimitError(V2CCloudError):
+    """The cloud asked us to slow down (429).
+
+    `retry_after` is the delay in seconds it asked for, if any.
+    """
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """Initialize."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class V2CCloudTransientError(V2CCloudError):
+    """The request failed in a way that may succeed later.
+
+    Timeouts, connection errors, 5xx responses and requests not sent because
+    the circuit is open or the scheduler shed them.
+    """
+
+
+class V2CCloudMalformedResponseError(V2CCloudError):
+    """The cloud answered with a payload that could not be parsed."""
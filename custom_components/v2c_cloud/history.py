@@ -0,0 +1,86 @@
+"""Recent requests of an API client, kept for the diagnostics download."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+
+from .cassette import REDACTED
+from .const import HISTORY_EVENTS, HISTORY_PAYLOADS
+
+EVENT_REQUEST = "request"
+EVENT_PARSE = "parse"
+EVENT_COMMAND = "command"
+
+
+class RequestHistory:
+    """Bounded buffers of the last raw payloads and request events.
+
+    Payloads are the bodies of the last /device/reported answers, as the
+    bytes objects already read, not copies. Events are request attempts,
+    parse outcomes and command calls with their latency. Adding is a tuple
+    and a deque append, nothing is logged or formatted until as_dict, and
+    the buffers are only created with the first entry.
+    """
+
+    __slots__ = ("_payloads", "_events")
+
+    def __init__(self) -> None:
+        """Initialize without buffers."""
+        self._payloads: deque[tuple[float, int, bytes]] | None = None
+        self._events: deque[tuple] | None = None
+
+    def add_payload(self, status: int, body: bytes) -> None:
+        """Keep a /device/reported body."""
+        if self._payloads is None:
+            self._payloads = deque(maxlen=HISTORY_PAYLOADS)
+        self._payloads.append((time.time(), status, body))
+
+    def add_event(
+        self,
+        kind: str,
+        name: str,
+        outcome: Any,
+        seconds: float | None = None,
+        detail: Any = None,
+    ) -> None:
+        """Keep an event, `outcome` is a status code, "ok" or an error name."""
+        if self._events is None:
+            self._events = deque(maxlen=HISTORY_EVENTS)
+        self._events.append((time.time(), kind, name, outcome, seconds, detail))
+
+    def as_dict(self, token: str | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Return the buffers oldest first, with `token` redacted."""
+
+        def _redact(text: str) -> str:
+            return text.replace(token, REDACTED) if token else text
+
+        def _time(timestamp: float) -> str:
+            return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+        return {
+            "payloads": [
+                {
+                    "time": _time(timestamp),
+                    "status": status,
+                    "body": _redact(body.decode("utf-8", "replace")),
+                }
+                for timestamp, status, body in self._payloads or ()
+            ],
+            "events": [
+                {
+                    "time": _time(timestamp),
+                    "kind": kind,
+                    "name": name,
+                    "outcome": outcome,
+                    "latency_ms": round(seconds * 1000, 1)
+                    if seconds is not None
+                    else None,
+                    "detail": _redact(str(detail)) if detail is not None else None,
+                }
+                for timestamp, kind, name, outcome, seconds, detail in (
+                    self._events or ()
+                )
+            ],
+        }
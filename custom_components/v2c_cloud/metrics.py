@@ -0,0 +1,122 @@
+"""Request metrics of the V2C Cloud API client."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds in seconds, 10 ms to about 60 s, each 25% above the last.
+# Percentiles are interpolated within a bucket, so they are off by less
+# than that.
+LATENCY_BUCKETS = tuple(round(0.01 * 1.25**index, 4) for index in range(40))
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_ERROR = "error"
+OUTCOME_TIMEOUT = "timeout"
+
+
+class LatencyHistogram:
+    """Count latencies in LATENCY_BUCKETS, recording one is a bisect."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize empty, the last count is for anything above the buckets."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Add one latency."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, quantile: float) -> float | None:
+        """Return the latency below which `quantile` of them fall."""
+        if not self.count:
+            return None
+        rank = quantile * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(LATENCY_BUCKETS):
+                    return self.max
+                lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+                upper = min(LATENCY_BUCKETS[index], self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+
+class EndpointStats:
+    """Outcomes, bytes received and latency of the requests to one endpoint.
+
+    Every attempt counts, retries included.
+    """
+
+    __slots__ = ("successes", "errors", "timeouts", "bytes_received", "latency")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.successes = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.bytes_received = 0
+        self.latency = LatencyHistogram()
+
+    @property
+    def requests(self) -> int:
+        """Return the number of attempts."""
+        return self.successes + self.errors + self.timeouts
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters and the p50/p95/p99 latency in ms."""
+        stats: dict[str, Any] = {
+            "requests": self.requests,
+            OUTCOME_SUCCESS: self.successes,
+            OUTCOME_ERROR: self.errors,
+            OUTCOME_TIMEOUT: self.timeouts,
+            "bytes_received": self.bytes_received,
+        }
+        for name, quantile in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            value = self.latency.quantile(quantile)
+            stats[f"latency_{name}_ms"] = (
+                round(value * 1000, 1) if value is not None else None
+            )
+        return stats
+
+
+class ApiMetrics:
+    """EndpointStats of one API client, by endpoint."""
+
+    __slots__ = ("endpoints", "requests")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.requests = 0
+
+    def record(
+        self, endpoint: str, seconds: float, outcome: str, size: int = 0
+    ) -> None:
+        """Add one attempt, `seconds` is how long it took."""
+        if (stats := self.endpoints.get(endpoint)) is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        if outcome == OUTCOME_SUCCESS:
+            stats.successes += 1
+        elif outcome == OUTCOME_TIMEOUT:
+            stats.timeouts += 1
+        else:
+            stats.errors += 1
+        stats.bytes_received += size
+        stats.latency.observe(seconds)
+        self.requests += 1
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return EndpointStats.as_dict of every endpoint used."""
+        return {
+            endpoint: stats.as_dict() for endpoint, stats in self.endpoints.items()
+        }
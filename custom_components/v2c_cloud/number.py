@@ -33,9 +33,20 @@ async def async_setup_entry(
 class V2CCloudNumber(V2CCloudEntity, NumberEntity):
     """V2C Cloud number entity."""
 
+    _unrecorded_attributes = frozenset(
+        key
+        for info in NUMBER_TYPES.values()
+        for key in info.get("static_attributes", ())
+    )
+
     def __init__(self, coordinator, number_type: str, number_info: dict[str, Any]):
         """Initialize the number entity."""
-        super().__init__(coordinator, number_type)
+        super().__init__(
+            coordinator,
+            number_type,
+            number_info.get("source_fields"),
+            number_info.get("static_attributes"),
+        )
         self._number_info = number_info
         self._attr_icon = number_info.get("icon")
         self._attr_native_min_value = number_info.get("min_value", 0)
@@ -48,38 +59,23 @@ class V2CCloudNumber(V2CCloudEntity, NumberEntity):
         self._attr_translation_key = number_info.get("translation_key")
         self._attr_has_entity_name = True
 
-    def _safe_float(self, value: Any, default: float = 0.0) -> float:
-        """Safely convert any value to float."""
-        try:
-            if value is None:
-                return default
-            return float(value)
-        except (ValueError, TypeError):
-            return default
-
-    def _safe_int(self, value: Any, default: int = 0) -> int:
-        """Safely convert any value to int."""
-        try:
-            if value is None:
-                return default
-            return int(float(value))
-        except (ValueError, TypeError):
-            return default
-
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        if not self.coordinator.data:
-            return None
-            
+        return self._derived.value
+
+    def _compute_value(self) -> float | None:
+        """Derive the value from the coordinator data."""
         data = self.coordinator.data
-        
+        if data is None:
+            return None
+
         if self._type == "intensity":
-            return self._safe_float(data.get("intensity", 6))
+            return data.intensity
         elif self._type == "max_intensity":
-            return self._safe_float(data.get("max_intensity", 32))
+            return self.coordinator.metadata.get("max_intensity", 32)
         elif self._type == "min_intensity":
-            return self._safe_float(data.get("min_intensity", 6))
+            return self.coordinator.metadata.get("min_intensity", 6)
         
         return None
 
@@ -89,9 +85,11 @@ class V2CCloudNumber(V2CCloudEntity, NumberEntity):
             int_value = int(value)
             
             if self._type == "intensity":
-                success = await self.coordinator.api.set_intensity(int_value)
+                # Shown right away, then rapid changes (slider drags, repeated
+                # setpoints) are collapsed and only the last value is sent
+                self.coordinator.async_set_optimistic({"intensity": int_value})
+                success = await self.coordinator.intensity_command.submit(int_value)
                 if success:
-                    await self.coordinator.async_request_refresh()
                     _LOGGER.info("Successfully set charging intensity to %s A", int_value)
                 else:
                     _LOGGER.error("Failed to set charging intensity to %s A", int_value)
@@ -107,43 +105,24 @@ class V2CCloudNumber(V2CCloudEntity, NumberEntity):
             _LOGGER.error("Error setting %s to %s: %s", self._type, value, err)
             raise
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any] | None:
-        """Return additional state attributes."""
-        if not self.coordinator.data:
-            return None
-            
+    def _compute_attributes(self) -> dict[str, Any] | None:
+        """Derive the additional state attributes."""
         data = self.coordinator.data
+        if data is None:
+            return None
+
         attributes = {}
-        
+
         if self._type == "intensity":
-            # Calculate power based on intensity (single phase) - FIXED string conversion
-            current_intensity = self._safe_float(data.get("intensity", 6))
-            voltage = self._safe_float(data.get("voltage", 230))
-            calculated_power = current_intensity * voltage
-            
+            # Calculate power based on intensity (single phase)
+            calculated_power = data.intensity * data.voltage
+
             attributes.update({
-                "calculated_power_w": round(calculated_power, 0),
+                "calculated_power_w": calculated_power,
                 "calculated_power_kw": round(calculated_power / 1000, 2),
-                "voltage": voltage,
-                "power_factor": "1.0",  # Assume unity power factor for EV charging
-                "charging_phases": 1,    # V2C Trydan is typically single-phase
-                "emhass_compatible": True,
-                "description": "Primary control for EMHASS optimization",
+                "voltage": data.voltage,
             })
-        elif self._type == "max_intensity":
-            attributes.update({
-                "description": "Maximum allowed charging current (hardware/installation limit)",
-                "configured_by": "installer_or_device_settings",
-                "safety_limit": True,
-            })
-        elif self._type == "min_intensity":
-            attributes.update({
-                "description": "Minimum charging current (technical minimum for stable charging)",
-                "iec_standard": "6A minimum per IEC 61851",
-                "technical_limit": True,
-            })
-        
+
         return attributes if attributes else None
 
     @property
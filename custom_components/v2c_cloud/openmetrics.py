@@ -0,0 +1,246 @@
+"""OpenMetrics export of the chargers and their API clients."""
+from __future__ import annotations
+
+from http import HTTPStatus
+import logging
+from typing import TYPE_CHECKING
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_OPENMETRICS, DOMAIN, OPENMETRICS_URL
+from .metrics import LATENCY_BUCKETS, OUTCOME_ERROR, OUTCOME_SUCCESS, OUTCOME_TIMEOUT
+
+if TYPE_CHECKING:
+    from .coordinator import V2CCloudDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Snapshot fields exported as gauges, by metric name. Energies are in Wh as
+# reported, the sensors show kWh.
+STATUS_GAUGES = {
+    "v2c_cloud_charge_power_watts": "charge_power",
+    "v2c_cloud_charge_energy_watt_hours": "charge_energy",
+    "v2c_cloud_charge_state": "charge_state",
+    "v2c_cloud_charge_current_amperes": "charge_current",
+    "v2c_cloud_voltage_volts": "voltage",
+    "v2c_cloud_temperature_celsius": "temperature",
+    "v2c_cloud_session_energy_watt_hours": "session_energy",
+    "v2c_cloud_session_time_minutes": "session_time",
+    "v2c_cloud_total_energy_watt_hours": "total_energy",
+    "v2c_cloud_wifi_signal_dbm": "wifi_signal",
+    "v2c_cloud_intensity_amperes": "intensity",
+    "v2c_cloud_dynamic_power": "dynamic_power",
+    "v2c_cloud_paused": "paused",
+    "v2c_cloud_locked": "locked",
+}
+
+# (name, type, help) of every family, in the order they are rendered
+FAMILIES = (
+    *(
+        (name, "gauge", f"Reported {field.replace('_', ' ')}")
+        for name, field in STATUS_GAUGES.items()
+    ),
+    ("v2c_cloud_charger", "info", "Charger firmware"),
+    ("v2c_cloud_up", "gauge", "1 while the entities show the charger's data"),
+    ("v2c_cloud_stale", "gauge", "1 while the data is from before a failed poll"),
+    ("v2c_cloud_consecutive_failures", "gauge", "Polls failed in a row"),
+    (
+        "v2c_cloud_last_update_timestamp_seconds",
+        "gauge",
+        "When the charger last reported",
+    ),
+    ("v2c_cloud_updates_skipped", "counter", "Updates without anything to show"),
+    ("v2c_cloud_state_writes", "counter", "Entity state writes, by result"),
+    ("v2c_cloud_api_requests", "counter", "Request attempts, by endpoint and outcome"),
+    ("v2c_cloud_api_received_bytes", "counter", "Response bytes, by endpoint"),
+    ("v2c_cloud_api_request_duration_seconds", "histogram", "Request latency"),
+)
+HEADERS = tuple(
+    f"# TYPE {name} {metric_type}\n# HELP {name} {help_text}.\n"
+    for name, metric_type, help_text in FAMILIES
+)
+
+_BUCKET_BOUNDS = (*(repr(float(bound)) for bound in LATENCY_BUCKETS), "+Inf")
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_device(coordinator: V2CCloudDataUpdateCoordinator) -> list[str]:
+    """Return the samples of a charger, one string per family of FAMILIES."""
+    device = f'device_id="{_escape(coordinator.api.device_id)}"'
+    samples: list[str] = []
+
+    status = coordinator.reported_data
+    for name, field in STATUS_GAUGES.items():
+        samples.append(
+            f"{name}{{{device}}} {int(getattr(status, field))}\n"
+            if status is not None
+            else ""
+        )
+    firmware = _escape(str(coordinator.metadata.get("firmware_version", "Unknown")))
+    samples.append(f'v2c_cloud_charger_info{{{device},firmware="{firmware}"}} 1\n')
+    samples.append(f"v2c_cloud_up{{{device}}} {int(coordinator.data_available)}\n")
+    samples.append(f"v2c_cloud_stale{{{device}}} {int(coordinator.stale)}\n")
+    samples.append(
+        f"v2c_cloud_consecutive_failures{{{device}}} "
+        f"{coordinator.consecutive_failures}\n"
+    )
+    samples.append(
+        f"v2c_cloud_last_update_timestamp_seconds{{{device}}} "
+        f"{coordinator.data_updated_at}\n"
+        if coordinator.data_updated_at is not None
+        else ""
+    )
+    samples.append(
+        f"v2c_cloud_updates_skipped_total{{{device}}} {coordinator.updates_skipped}\n"
+    )
+    samples.append(
+        f'v2c_cloud_state_writes_total{{{device},result="emitted"}} '
+        f"{coordinator.writes_emitted}\n"
+        f'v2c_cloud_state_writes_total{{{device},result="suppressed"}} '
+        f"{coordinator.writes_suppressed}\n"
+    )
+
+    requests, received, durations = [], [], []
+    for endpoint, stats in coordinator.api.metrics.endpoints.items():
+        labels = f'{device},endpoint="{_escape(endpoint)}"'
+        for outcome, count in (
+            (OUTCOME_SUCCESS, stats.successes),
+            (OUTCOME_ERROR, stats.errors),
+            (OUTCOME_TIMEOUT, stats.timeouts),
+        ):
+            requests.append(
+                f'v2c_cloud_api_requests_total{{{labels},outcome="{outcome}"}} '
+                f"{count}\n"
+            )
+        received.append(
+            f"v2c_cloud_api_received_bytes_total{{{labels}}} {stats.bytes_received}\n"
+        )
+        latency = stats.latency
+        cumulative = 0
+        for bound, count in zip(_BUCKET_BOUNDS, latency.counts):
+            cumulative += count
+            durations.append(
+                "v2c_cloud_api_request_duration_seconds_bucket"
+                f'{{{labels},le="{bound}"}} {cumulative}\n'
+            )
+        durations.append(
+            f"v2c_cloud_api_request_duration_seconds_count{{{labels}}} "
+            f"{latency.count}\n"
+            f"v2c_cloud_api_request_duration_seconds_sum{{{labels}}} "
+            f"{latency.total}\n"
+        )
+    samples.extend(("".join(requests), "".join(received), "".join(durations)))
+    return samples
+
+
+class OpenMetricsExporter:
+    """Render the chargers added to it in the OpenMetrics text format.
+
+    The samples of a charger are rendered again only once its coordinator
+    notified a change, or it counted another update or request, and are
+    cached otherwise. A scrape joins the cached text, it reads nothing from
+    the cloud.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._devices: dict[str, V2CCloudDataUpdateCoordinator] = {}
+        self._cache: dict[str, tuple[tuple, list[str]]] = {}
+
+    @property
+    def device_count(self) -> int:
+        """Return how many chargers are exported."""
+        return len(self._devices)
+
+    @callback
+    def async_add(self, coordinator: V2CCloudDataUpdateCoordinator) -> CALLBACK_TYPE:
+        """Export a charger until the returned callback is called."""
+        device_id = coordinator.api.device_id
+        self._devices[device_id] = coordinator
+
+        @callback
+        def _remove() -> None:
+            self._devices.pop(device_id, None)
+            self._cache.pop(device_id, None)
+
+        return _remove
+
+    def _device_samples(
+        self, device_id: str, coordinator: V2CCloudDataUpdateCoordinator
+    ) -> list[str]:
+        """Return the samples of a charger, from the cache if still current."""
+        # Failures and availability are counted without a notification
+        key = (
+            coordinator.data_version,
+            coordinator.updates_skipped,
+            coordinator.consecutive_failures,
+            coordinator.data_available,
+            coordinator.api.metrics.requests,
+        )
+        if (cached := self._cache.get(device_id)) is not None and cached[0] == key:
+            return cached[1]
+        samples = render_device(coordinator)
+        self._cache[device_id] = (key, samples)
+        return samples
+
+    @callback
+    def async_render(self) -> str:
+        """Return the exposition of every charger."""
+        devices = [
+            self._device_samples(device_id, coordinator)
+            for device_id, coordinator in self._devices.items()
+        ]
+        parts: list[str] = []
+        for index, header in enumerate(HEADERS):
+            parts.append(header)
+            parts.extend(samples[index] for samples in devices)
+        parts.append("# EOF\n")
+        return "".join(parts)
+
+
+class OpenMetricsView(HomeAssistantView):
+    """Serve the exposition, with the usual Home Assistant authentication."""
+
+    url = OPENMETRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self, exporter: OpenMetricsExporter) -> None:
+        """Initialize."""
+        self._exporter = exporter
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics of the chargers that export them."""
+        if not self._exporter.device_count:
+            return self.json_message(
+                "No charger has the OpenMetrics export enabled", HTTPStatus.NOT_FOUND
+            )
+        return web.Response(
+            body=self._exporter.async_render().encode(),
+            headers={hdrs.CONTENT_TYPE: CONTENT_TYPE},
+        )
+
+
+@callback
+def async_get_exporter(hass: HomeAssistant) -> OpenMetricsExporter | None:
+    """Return the exporter, registering its view when first asked for it.
+
+    Views cannot be removed, once registered it answers 404 while no
+    charger exports metrics.
+    """
+    data = hass.data[DOMAIN]
+    if (exporter := data.get(DATA_OPENMETRICS)) is None:
+        if hass.http is None:
+            _LOGGER.warning("The OpenMetrics export needs the http integration")
+            return None
+        exporter = data[DATA_OPENMETRICS] = OpenMetricsExporter()
+        hass.http.register_view(OpenMetricsView(exporter))
+    return exporter
@@ -0,0 +1,64 @@
+"""Adaptive polling policy for V2C Cloud devices."""
+from __future__ import annotations
+
+import time
+
+# charge_state values, see CHARGE_STATES
+STATE_DISCONNECTED = 0
+STATE_CHARGING = 2
+
+
+class AdaptivePollPolicy:
+    """Pick a poll interval from the last reported charge state.
+
+    Charging devices are polled fast, disconnected ones slowly and anything
+    else (connected but idle, paused, error, unknown) at the medium rate.
+    After a command the device is polled fast for `burst_duration` seconds.
+    Intervals out of order are clamped so that fast <= medium <= slow.
+    """
+
+    def __init__(
+        self, fast: int, medium: int, slow: int, burst_duration: int
+    ) -> None:
+        """Initialize."""
+        self.slow = slow
+        self.medium = min(medium, slow)
+        self.fast = min(fast, self.medium)
+        self._burst_duration = burst_duration
+        self._burst_until = 0.0
+
+    def start_burst(self) -> None:
+        """Poll fast for a while, typically after a command."""
+        self._burst_until = time.monotonic() + self._burst_duration
+
+    @property
+    def in_burst(self) -> bool:
+        """Return True while a post-command burst is running."""
+        return time.monotonic() < self._burst_until
+
+    def interval(self, charge_state: int | None) -> int:
+        """Return the seconds until the next poll."""
+        if self.in_burst or charge_state == STATE_CHARGING:
+            return self.fast
+        if charge_state == STATE_DISCONNECTED:
+            return self.slow
+        return self.medium
+
+
+class StalenessBudget:
+    """Decide how long a snapshot may be shown once polls start failing.
+
+    The snapshot stays available, marked stale, until `max_failures` polls
+    in a row failed or it is `max_age` seconds old.
+    """
+
+    def __init__(self, max_failures: int, max_age: int) -> None:
+        """Initialize."""
+        self.max_failures = max_failures
+        self.max_age = max_age
+
+    def allows(self, failures: int, age: float | None) -> bool:
+        """Return True if a snapshot may still be shown."""
+        if failures >= self.max_failures:
+            return False
+        return age is None or age < self.max_age
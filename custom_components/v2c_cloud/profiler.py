@@ -0,0 +1,118 @@
+"""Timing breakdown of fleet poll cycles, see the v2c_cloud.profile service."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import pstats
+from datetime import datetime
+
+STAGE_QUEUE_WAIT = "queue_wait"
+STAGE_NETWORK = "network"
+STAGE_BODY_READ = "body_read"
+STAGE_PARSE = "parse"
+STAGE_DIFF = "diff"
+STAGE_ENTITY_VALUES = "entity_values"
+STAGE_STATE_WRITES = "state_writes"
+STAGES = (
+    STAGE_QUEUE_WAIT,
+    STAGE_NETWORK,
+    STAGE_BODY_READ,
+    STAGE_PARSE,
+    STAGE_DIFF,
+    STAGE_ENTITY_VALUES,
+    STAGE_STATE_WRITES,
+)
+PROFILE_TOP_FUNCTIONS = 40
+
+
+class CycleProfiler:
+    """Collect stage timings over the next `cycles` fleet poll cycles.
+
+    Accounts pick the profiler up when a cycle starts and hand it to their
+    API clients and device coordinators, which time their stages while it
+    is set. A cycle runs from the start of the fetch to the end of
+    publishing it to the entities. With `cprofile` everything the event
+    loop runs during cycles is captured as well.
+    """
+
+    def __init__(self, cycles: int, cprofile: bool = False) -> None:
+        """Initialize."""
+        self.remaining = cycles
+        self.started_at = datetime.now().astimezone()
+        self.timings: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        self.cycles: list[float] = []
+        self.profile = cProfile.Profile() if cprofile else None
+        self.done = asyncio.Event()
+        self._running = 0
+
+    @property
+    def finished(self) -> bool:
+        """Return True once enough cycles were recorded."""
+        return self.remaining <= 0
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add the time one call spent in a stage."""
+        self.timings[stage].append(seconds)
+
+    def start_cycle(self) -> None:
+        """Note a cycle started, the profile runs while any cycle does."""
+        if self.finished:
+            return
+        self._running += 1
+        if self.profile is not None and self._running == 1:
+            self.profile.enable()
+
+    def end_cycle(self, seconds: float) -> None:
+        """Note a cycle ended after `seconds`."""
+        self._running = max(0, self._running - 1)
+        if self.profile is not None and not self._running:
+            self.profile.disable()
+        if not self.finished:
+            self.cycles.append(seconds)
+            self.remaining -= 1
+            if self.finished:
+                self.stop()
+
+    def stop(self) -> None:
+        """Stop recording, e.g. when cycles did not come in time."""
+        self.remaining = 0
+        if self.profile is not None and self._running:
+            self.profile.disable()
+        self._running = 0
+        self.done.set()
+
+    def report(self) -> str:
+        """Return the timing table, and the hottest functions if profiled."""
+        lines = [
+            f"V2C Cloud profile started {self.started_at.isoformat()}, "
+            f"{len(self.cycles)} cycles",
+            "",
+            "Stages of concurrent requests overlap, their totals can add up to",
+            "more than the cycle time. state_writes excludes entity_values.",
+            "",
+            f"{'stage':<14} {'count':>7} {'total ms':>10} {'mean ms':>9} "
+            f"{'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}",
+        ]
+        for stage, values in (*self.timings.items(), ("cycle", self.cycles)):
+            if not values:
+                lines.append(f"{stage:<14} {0:>7}")
+                continue
+            ordered = sorted(values)
+            total = sum(values) * 1000
+            median = ordered[len(ordered) // 2] * 1000
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000
+            lines.append(
+                f"{stage:<14} {len(values):>7} {total:>10.2f} "
+                f"{total / len(values):>9.3f} {median:>9.3f} {p95:>9.3f} "
+                f"{ordered[-1] * 1000:>9.3f}"
+            )
+
+        if self.profile is not None and self.cycles:
+            stream = io.StringIO()
+            stats = pstats.Stats(self.profile, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                PROFILE_TOP_FUNCTIONS
+            )
+            lines.extend(("", stream.getvalue()))
+        return "\n".join(lines) + "\n"
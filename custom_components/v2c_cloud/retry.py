@@ -0,0 +1,96 @@
+"""Retry backoff and circuit breaking for V2C Cloud API requests."""
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from .const import API_CIRCUIT_FAILURE_THRESHOLD, API_CIRCUIT_RESET_TIMEOUT
+
+# Statuses worth another attempt, 429/503 may carry a Retry-After header
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Return an exponential backoff delay with full jitter."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """Fail fast while a host keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests are refused for `reset_timeout` seconds. Then a single probe is
+    let through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """Initialize a closed circuit."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = STATE_CLOSED
+
+    @property
+    def state(self) -> str:
+        """Return the circuit state."""
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self._state == STATE_CLOSED:
+            return True
+        if time.monotonic() - self._opened_at < self._reset_timeout:
+            return False
+        # Let one probe through, and another one only if it never reports back
+        self._state = STATE_HALF_OPEN
+        self._opened_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful exchange with the host."""
+        self._failures = 0
+        self._state = STATE_CLOSED
+
+    def record_failure(self) -> None:
+        """Count a failure and open the circuit when the threshold is reached."""
+        self._failures += 1
+        if self._state == STATE_HALF_OPEN or self._failures >= self._failure_threshold:
+            self._state = STATE_OPEN
+            self._opened_at = time.monotonic()
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """Return the circuit breaker shared by every client talking to `host`."""
+    if (breaker := _BREAKERS.get(host)) is None:
+        breaker = _BREAKERS[host] = CircuitBreaker(
+            API_CIRCUIT_FAILURE_THRESHOLD, API_CIRCUIT_RESET_TIMEOUT
+        )
+    return breaker
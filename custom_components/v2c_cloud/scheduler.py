@@ -0,0 +1,139 @@
+"""Rate limiting and priority scheduling for V2C Cloud API requests."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any
+
+from .exceptions import V2CCloudTransientError
+
+# Lower value is served first
+PRIORITY_COMMAND = 0
+PRIORITY_REFRESH = 1
+PRIORITY_POLL = 2
+
+
+class RequestShedError(V2CCloudTransientError):
+    """Raised when a queued request is dropped to relieve pressure."""
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` requests per second with bursts of `burst`."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize the bucket full."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take one token if available."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def delay(self) -> float:
+        """Return the seconds until one token is available."""
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self._rate)
+
+
+class RequestScheduler:
+    """Shape all requests made with one API token.
+
+    Requests take a token from a shared bucket. When none is available they
+    wait in a priority queue so user commands are sent before background
+    polls, and when the queue is full the lowest priority waiters are shed.
+    """
+
+    def __init__(self, rate: float, burst: int, max_queue: int) -> None:
+        """Initialize the scheduler."""
+        self._bucket = TokenBucket(rate, burst)
+        self._max_queue = max_queue
+        self._queue: list[tuple[int, int, float, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: asyncio.Task[None] | None = None
+
+        self._granted = 0
+        self._shed = 0
+        self._max_depth = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def acquire(self, priority: int) -> None:
+        """Wait until a request with the given priority may be sent."""
+        if not self._queue and self._bucket.try_acquire():
+            self._record_wait(0.0)
+            return
+
+        if len(self._queue) >= self._max_queue:
+            self._make_room(priority)
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        enqueued = time.monotonic()
+        heapq.heappush(self._queue, (priority, next(self._sequence), enqueued, future))
+        self._max_depth = max(self._max_depth, len(self._queue))
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        await future
+        self._record_wait(time.monotonic() - enqueued)
+
+    def _make_room(self, priority: int) -> None:
+        """Shed the newest lowest-priority waiter, or refuse a poll."""
+        victim = max(self._queue, key=lambda item: (item[0], item[1]))
+        if victim[0] > priority:
+            self._queue.remove(victim)
+            heapq.heapify(self._queue)
+            victim[3].set_exception(RequestShedError("Request shed by scheduler"))
+            self._shed += 1
+        elif priority == PRIORITY_POLL:
+            self._shed += 1
+            raise RequestShedError("Request queue full")
+        # Commands and refreshes are never refused, the queue grows past its
+        # bound until the bucket catches up.
+
+    async def _dispatch(self) -> None:
+        """Release queued waiters in priority order as tokens become available."""
+        while self._queue:
+            if delay := self._bucket.delay():
+                await asyncio.sleep(delay)
+                continue
+            _, _, _, future = heapq.heappop(self._queue)
+            if future.done():
+                # The waiter was cancelled while queued
+                continue
+            self._bucket.try_acquire()
+            future.set_result(None)
+
+    def _record_wait(self, wait: float) -> None:
+        """Update wait time statistics."""
+        self._granted += 1
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return queue depth and wait time statistics."""
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self._max_depth,
+            "granted": self._granted,
+            "shed": self._shed,
+            "wait_avg_ms": round(self._wait_total / self._granted * 1000, 1)
+            if self._granted
+            else 0.0,
+            "wait_max_ms": round(self._wait_max * 1000, 1),
+        }
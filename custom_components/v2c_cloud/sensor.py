@@ -9,10 +9,17 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, SENSOR_TYPES, CHARGE_STATES
+from .const import (
+    API_LATENCY_ENDPOINT,
+    API_SENSOR_TYPES,
+    DOMAIN,
+    SENSOR_TYPES,
+    CHARGE_STATES,
+)
 from .entity import V2CCloudEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -29,6 +36,8 @@ async def async_setup_entry(
     entities = []
     for sensor_type, sensor_info in SENSOR_TYPES.items():
         entities.append(V2CCloudSensor(coordinator, sensor_type, sensor_info))
+    for sensor_type, sensor_info in API_SENSOR_TYPES.items():
+        entities.append(V2CCloudApiSensor(coordinator, sensor_type, sensor_info))
     
     async_add_entities(entities)
 
@@ -36,9 +45,20 @@ async def async_setup_entry(
 class V2CCloudSensor(V2CCloudEntity, SensorEntity):
     """V2C Cloud sensor entity."""
 
+    _unrecorded_attributes = frozenset(
+        key
+        for info in SENSOR_TYPES.values()
+        for key in info.get("static_attributes", ())
+    )
+
     def __init__(self, coordinator, sensor_type: str, sensor_info: dict[str, Any]):
         """Initialize the sensor."""
-        super().__init__(coordinator, sensor_type)
+        super().__init__(
+            coordinator,
+            sensor_type,
+            sensor_info.get("source_fields"),
+            sensor_info.get("static_attributes"),
+        )
         self._sensor_info = sensor_info
         self._attr_device_class = sensor_info.get("device_class")
         self._attr_native_unit_of_measurement = sensor_info.get("unit")
@@ -49,110 +69,83 @@ class V2CCloudSensor(V2CCloudEntity, SensorEntity):
         self._attr_translation_key = sensor_info.get("translation_key")
         self._attr_has_entity_name = True
 
-    def _safe_float(self, value: Any, default: float = 0.0) -> float:
-        """Safely convert any value to float."""
-        try:
-            if value is None:
-                return default
-            return float(value)
-        except (ValueError, TypeError):
-            return default
-
-    def _safe_int(self, value: Any, default: int = 0) -> int:
-        """Safely convert any value to int."""
-        try:
-            if value is None:
-                return default
-            return int(float(value))
-        except (ValueError, TypeError):
-            return default
-
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
-            
+        return self._derived.value
+
+    def _compute_value(self) -> Any:
+        """Derive the value from the coordinator data."""
         data = self.coordinator.data
-        
+        if data is None:
+            return None
+
         if self._type == "charge_state":
-            state_value = self._safe_int(data.get("charge_state", 99))
-            return CHARGE_STATES.get(state_value, "unknown")
+            return CHARGE_STATES.get(data.charge_state, "unknown")
         elif self._type == "charge_power":
-            return self._safe_float(data.get("charge_power", 0))
+            return data.charge_power
         elif self._type == "charge_energy":
             # Convert Wh to kWh for display
-            return round(self._safe_float(data.get("charge_energy", 0)) / 1000, 2)
+            return round(data.charge_energy / 1000, 2)
         elif self._type == "charge_current":
-            return self._safe_float(data.get("charge_current", 0))
+            return data.charge_current
         elif self._type == "voltage":
-            return self._safe_float(data.get("voltage", 0))
+            return data.voltage
         elif self._type == "temperature":
-            return self._safe_float(data.get("temperature", 0))
+            return data.temperature
         elif self._type == "session_energy":
             # Convert Wh to kWh for display
-            return round(self._safe_float(data.get("session_energy", 0)) / 1000, 2)
+            return round(data.session_energy / 1000, 2)
         elif self._type == "session_time":
-            return self._safe_float(data.get("session_time", 0))
+            return data.session_time
         elif self._type == "total_energy":
             # Convert Wh to kWh for display
-            return round(self._safe_float(data.get("total_energy", 0)) / 1000, 2)
+            return round(data.total_energy / 1000, 2)
         elif self._type == "wifi_signal":
-            return self._safe_int(data.get("wifi_signal", 0))
+            return data.wifi_signal
         elif self._type == "firmware_version":
-            firmware = data.get("firmware_version", "Unknown")
-            return str(firmware) if firmware is not None else "Unknown"
+            # Slow-changing field, read from the metadata tier
+            return self.coordinator.metadata.get("firmware_version", "Unknown")
         
         return None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any] | None:
-        """Return additional state attributes."""
-        if not self.coordinator.data:
-            return None
-            
+    def _compute_attributes(self) -> dict[str, Any] | None:
+        """Derive the additional state attributes."""
         data = self.coordinator.data
+        if data is None:
+            return None
+
         attributes = {}
-        
+
         if self._type == "charge_state":
+            age = self.coordinator.data_age_seconds
             attributes.update({
-                "last_updated": data.get("last_updated", ""),
-                "raw_state": data.get("charge_state"),
-                "connection_time": data.get("connection_time", ""),
+                "last_updated": data.last_updated,
+                "raw_state": data.charge_state,
+                "stale": self.coordinator.stale,
+                "data_age_seconds": round(age) if age is not None else None,
             })
         elif self._type == "charge_power":
-            # FIXED: Safe conversion to avoid string/int errors
-            current_intensity = self._safe_float(data.get("intensity", 0))
-            voltage = self._safe_float(data.get("voltage", 230))
-            
             attributes.update({
-                "max_power": 7400,  # V2C Trydan max power (32A * 230V)
-                "min_power": 1380,  # 6A * 230V
-                "current_intensity": current_intensity,
-                "voltage": voltage,
-                "efficiency": "95%",  # Typical EV charger efficiency
+                "current_intensity": data.intensity,
+                "voltage": data.voltage,
             })
         elif self._type in ["charge_energy", "session_energy", "total_energy"]:
-            # Additional energy-related attributes - FIXED: Safe conversion
-            energy_wh = self._safe_float(data.get(self._type, 0))
+            # Additional energy-related attributes
+            energy_wh = getattr(data, self._type)
             attributes.update({
                 "energy_wh": energy_wh,
                 "cost_estimate": round(energy_wh * 0.15 / 1000, 2),  # Rough cost estimate
             })
         elif self._type == "charge_current":
-            # FIXED: Safe conversion
-            max_intensity = self._safe_float(data.get("max_intensity", 32))
-            min_intensity = self._safe_float(data.get("min_intensity", 6))
-            current_limit = self._safe_float(data.get("intensity", 6))
-            
+            metadata = self.coordinator.metadata
             attributes.update({
-                "max_current": max_intensity,
-                "min_current": min_intensity,
-                "current_limit": current_limit,
+                "max_current": metadata.get("max_intensity", 32),
+                "min_current": metadata.get("min_intensity", 6),
+                "current_limit": data.intensity,
             })
         elif self._type == "wifi_signal":
-            # FIXED: Safe conversion
-            signal = self._safe_int(data.get("wifi_signal", -50))
+            signal = data.wifi_signal
             if signal > -30:
                 quality = "Excellent"
             elif signal > -50:
@@ -166,4 +159,51 @@ class V2CCloudSensor(V2CCloudEntity, SensorEntity):
                 "signal_bars": min(4, max(0, int((signal + 100) / 12.5))),
             })
         
-        return attributes if attributes else None
\ No newline at end of file
+        return attributes if attributes else None
+
+class V2CCloudApiSensor(V2CCloudSensor):
+    """Diagnostic sensor on the requests of the charger's API client.
+
+    Attributes break the state down by endpoint. Every attempt counts,
+    retries included.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    async def async_added_to_hass(self) -> None:
+        """Have the coordinator report metric changes while we are added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_track_api_metrics())
+
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics are kept while the cloud is unreachable."""
+        return True
+
+    def _compute_value(self) -> Any:
+        """Derive the value from the API client metrics."""
+        metrics = self.coordinator.api.metrics
+        if self._type == "api_latency":
+            stats = metrics.endpoints.get(API_LATENCY_ENDPOINT)
+            return stats.as_dict()["latency_p95_ms"] if stats else None
+        if self._type == "api_requests":
+            return metrics.requests
+        if self._type == "api_errors":
+            return sum(
+                stats.errors + stats.timeouts for stats in metrics.endpoints.values()
+            )
+        return None
+
+    def _compute_attributes(self) -> dict[str, Any] | None:
+        """Break the value down by endpoint."""
+        if self._type == "api_latency":
+            keys = ("latency_p50_ms", "latency_p95_ms", "latency_p99_ms")
+        elif self._type == "api_requests":
+            keys = ("requests", "bytes_received")
+        else:
+            keys = ("error", "timeout")
+        return {
+            endpoint: {key: stats[key] for key in keys}
+            for endpoint, stats in self.coordinator.api.metrics.as_dict().items()
+        } or None
@@ -0,0 +1,102 @@
+"""Services of the V2C Cloud integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import async_timeout
+import voluptuous as vol
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CPROFILE,
+    ATTR_CYCLES,
+    ATTR_TIMEOUT,
+    DATA_ACCOUNTS,
+    DATA_PROFILER,
+    DOMAIN,
+    PROFILE_DEFAULT_CYCLES,
+    PROFILE_DEFAULT_TIMEOUT,
+    SERVICE_PROFILE,
+)
+from .profiler import CycleProfiler
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=PROFILE_DEFAULT_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+        vol.Optional(ATTR_CPROFILE, default=False): bool,
+        vol.Optional(ATTR_TIMEOUT, default=PROFILE_DEFAULT_TIMEOUT): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=86400)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services."""
+
+    async def _async_profile(call: ServiceCall) -> None:
+        """Time the next fleet poll cycles and write a report."""
+        data = hass.data.setdefault(DOMAIN, {})
+        if data.get(DATA_PROFILER) is not None:
+            raise HomeAssistantError("A V2C Cloud profile is already running")
+        if not data.get(DATA_ACCOUNTS):
+            raise HomeAssistantError("No V2C Cloud charger is set up")
+
+        profiler = data[DATA_PROFILER] = CycleProfiler(
+            call.data[ATTR_CYCLES], call.data[ATTR_CPROFILE]
+        )
+        # Cycles come at the pace of the poll intervals, don't hold the call
+        hass.async_create_background_task(
+            _async_run_profile(hass, profiler, call.data[ATTR_TIMEOUT]),
+            f"{DOMAIN} profile",
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA
+    )
+
+
+async def _async_run_profile(
+    hass: HomeAssistant, profiler: CycleProfiler, timeout: int
+) -> None:
+    """Wait for the profiled cycles, then write the report."""
+    try:
+        async with async_timeout.timeout(timeout):
+            await profiler.done.wait()
+    except asyncio.TimeoutError:
+        _LOGGER.info(
+            "Only %s of the profiled cycles ran in %ss", len(profiler.cycles), timeout
+        )
+    finally:
+        profiler.stop()
+        hass.data[DOMAIN][DATA_PROFILER] = None
+
+    base = hass.config.path(f"{DOMAIN}_profile_{dt_util.now():%Y%m%d-%H%M%S}")
+    path = await hass.async_add_executor_job(_write_report, base, profiler)
+    _LOGGER.info("V2C Cloud profile written to %s", path)
+    persistent_notification.async_create(
+        hass,
+        f"Timing breakdown of {len(profiler.cycles)} poll cycles written to {path}",
+        title="V2C Cloud profile",
+        notification_id=f"{DOMAIN}_profile",
+    )
+
+
+def _write_report(base: str, profiler: CycleProfiler) -> str:
+    """Write the report, and the raw cProfile stats next to it."""
+    path = f"{base}.txt"
+    with open(path, "w", encoding="utf-8") as report:
+        report.write(profiler.report())
+    if profiler.profile is not None and profiler.cycles:
+        profiler.profile.dump_stats(f"{base}.prof")
+    return path
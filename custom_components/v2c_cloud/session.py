@@ -0,0 +1,117 @@
+"""Dedicated HTTP session for the V2C Cloud API."""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import ssl as ssl_util
+
+from .const import (
+    DEDICATED_CONNECTIONS_PER_HOST,
+    DEDICATED_DNS_CACHE_TTL,
+    DEDICATED_KEEPALIVE_TIMEOUT,
+)
+
+
+class ConnectionStats:
+    """Count new and reused connections of a session, fed by aiohttp tracing.
+
+    Every new connection costs a TCP and TLS handshake, the reuse ratio shows
+    how well keep-alive amortises them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.connect_seconds = 0.0
+        self.dns_resolutions = 0
+        self.dns_cache_hits = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a TraceConfig feeding these counters."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_start.append(self._on_connect_start)
+        trace_config.on_connection_create_end.append(self._on_connect_end)
+        trace_config.on_connection_reuseconn.append(self._on_reuse)
+        trace_config.on_dns_resolvehost_end.append(self._on_dns_resolved)
+        trace_config.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        return trace_config
+
+    async def _on_request_start(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.requests += 1
+
+    async def _on_connect_start(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        context.connect_start = time.perf_counter()
+
+    async def _on_connect_end(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.new_connections += 1
+        self.connect_seconds += time.perf_counter() - context.connect_start
+
+    async def _on_reuse(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.reused_connections += 1
+
+    async def _on_dns_resolved(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.dns_resolutions += 1
+
+    async def _on_dns_cache_hit(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        self.dns_cache_hits += 1
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Return the counters, the reuse ratio and the mean handshake time."""
+        connections = self.new_connections + self.reused_connections
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(
+                self.reused_connections / connections, 3
+            ) if connections else 0.0,
+            "connect_avg_ms": round(
+                self.connect_seconds / self.new_connections * 1000, 1
+            ) if self.new_connections else 0.0,
+            "dns_resolutions": self.dns_resolutions,
+            "dns_cache_hits": self.dns_cache_hits,
+        }
+
+
+@callback
+def async_create_session(
+    hass: HomeAssistant, limit_per_host: int = DEDICATED_CONNECTIONS_PER_HOST
+) -> tuple[aiohttp.ClientSession, ConnectionStats]:
+    """Create a keep-alive session with its own connection pool and DNS cache.
+
+    HA's shared session pools connections with every other integration. The
+    caller owns the returned session and must close it.
+    """
+    stats = ConnectionStats()
+    connector = aiohttp.TCPConnector(
+        ssl=ssl_util.get_default_context(),
+        limit_per_host=limit_per_host,
+        keepalive_timeout=DEDICATED_KEEPALIVE_TIMEOUT,
+        use_dns_cache=True,
+        ttl_dns_cache=DEDICATED_DNS_CACHE_TTL,
+    )
+    session = aiohttp.ClientSession(
+        connector=connector, trace_configs=[stats.trace_config()]
+    )
+    return session, stats
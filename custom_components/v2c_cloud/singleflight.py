@@ -0,0 +1,94 @@
+"""Coalescing of concurrent identical V2C Cloud API reads."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """Share one in-flight call, and briefly its result, between callers.
+
+    Concurrent callers using the same key await the same task. A successful
+    result is reused for `ttl` seconds. Results are shared objects, callers
+    must not mutate them. A call outlives its cancelled callers, its failure
+    is then retrieved here so it is not reported as never retrieved.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        """Initialize."""
+        self._ttl = ttl
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+        self._results: dict[Hashable, tuple[float, Any]] = {}
+        # Every running call, detached ones included, for cancel()
+        self._tasks: set[asyncio.Task[Any]] = set()
+        self._generation = 0
+        self.calls = 0
+        self.coalesced = 0
+        self.reused = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of `func`, sharing it with identical callers."""
+        if self._ttl and (cached := self._results.get(key)) is not None:
+            stored_at, result = cached
+            if time.monotonic() - stored_at < self._ttl:
+                self.reused += 1
+                return result
+            del self._results[key]
+
+        if (task := self._inflight.get(key)) is None:
+            self.calls += 1
+            task = self._inflight[key] = asyncio.create_task(self._run(key, func))
+            self._tasks.add(task)
+            task.add_done_callback(self._done)
+        else:
+            self.coalesced += 1
+
+        # Shielded so one caller being cancelled does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run the shared call and remember a successful result."""
+        task = asyncio.current_task()
+        generation = self._generation
+        try:
+            result = await func()
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+        # A result fetched across a forget() may predate the command
+        if self._ttl and result is not None and generation == self._generation:
+            self._results[key] = (time.monotonic(), result)
+        return result
+
+    def _done(self, task: asyncio.Task[Any]) -> None:
+        """Stop tracking a finished call and retrieve its failure."""
+        self._tasks.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    def cancel(self) -> None:
+        """Cancel the running calls, on shutdown."""
+        for task in self._tasks:
+            task.cancel()
+        self._inflight.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return how many calls were made, coalesced and served from cache."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "reused": self.reused,
+        }
+
+    def forget(self) -> None:
+        """Drop reusable results and detach in-flight calls from new callers.
+
+        Used after a command so the next read observes the new device state.
+        """
+        self._generation += 1
+        self._inflight.clear()
+        self._results.clear()
@@ -0,0 +1,215 @@
+"""Parsing of V2C Cloud /device/reported payloads."""
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable, Mapping
+from typing import Annotated, Any, NamedTuple, get_type_hints
+
+from .const import METADATA_FIELDS
+from .exceptions import V2CCloudMalformedResponseError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _to_int(value: Any) -> int:
+    """Convert a reported number sent with decimals, e.g. "16.0"."""
+    return int(float(value))
+
+
+def _to_bool(value: Any) -> bool:
+    """Convert a reported flag, sent as 1/0."""
+    if isinstance(value, str):
+        return value.strip() == "1"
+    return bool(value)
+
+
+def _to_str(value: Any) -> str:
+    """Convert a reported string."""
+    return str(value).strip()
+
+
+# Converter tried first, and the slower one used when it raises
+_CONVERTERS: dict[type, tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    int: (int, _to_int),
+    bool: (_to_bool, _to_bool),
+    str: (_to_str, _to_str),
+}
+
+
+class V2CStatus(NamedTuple):
+    """Immutable, typed snapshot of one /device/reported payload.
+
+    The fields are the schema: their type picks the converter and the
+    Annotated string is the payload key they are read from (one key may feed
+    several fields). The slow-changing fields listed in METADATA_FIELDS are
+    parsed too, the coordinator keeps them apart (see `metadata`).
+    """
+
+    charge_power: Annotated[int, "power"] = 0
+    charge_energy: Annotated[int, "energy"] = 0
+    charge_state: Annotated[int, "state"] = 99
+    charge_current: Annotated[int, "intensity"] = 0
+    voltage: Annotated[int, "voltage"] = 230
+    temperature: Annotated[int, "temperature"] = 0
+    session_energy: Annotated[int, "session_energy"] = 0
+    session_time: Annotated[int, "session_time"] = 0
+    total_energy: Annotated[int, "total_energy"] = 0
+    wifi_signal: Annotated[int, "wifi_signal"] = -50
+    intensity: Annotated[int, "intensity"] = 6
+    dynamic_power: Annotated[bool, "dynamic"] = False
+    paused: Annotated[bool, "paused"] = False
+    locked: Annotated[bool, "locked"] = False
+    last_updated: str = ""
+    firmware_version: Annotated[str, "firmware"] = "Unknown"
+    max_intensity: Annotated[int, "max_intensity"] = 32
+    min_intensity: Annotated[int, "min_intensity"] = 6
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> V2CStatus:
+        """Rebuild a snapshot saved with _asdict(), ignoring unknown fields."""
+        return cls(**{key: value for key, value in data.items() if key in cls._fields})
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """Return the slow-changing fields."""
+        return {name: getattr(self, name) for name in METADATA_FIELDS}
+
+    def changed_fields(self, other: V2CStatus | None) -> set[str]:
+        """Return the live fields whose value differs in `other`."""
+        if other is None:
+            return set(LIVE_FIELDS)
+        return {
+            name
+            for index, name in _LIVE_INDEXES
+            if self[index] != other[index]
+        }
+
+
+LIVE_FIELDS = tuple(
+    name for name in V2CStatus._fields if name not in METADATA_FIELDS
+)
+_LIVE_INDEXES = tuple(
+    (index, name)
+    for index, name in enumerate(V2CStatus._fields)
+    if name in LIVE_FIELDS
+)
+
+
+class StatusParser:
+    """Parse payloads into V2CStatus in a single pass over their pairs.
+
+    The schema is compiled once into a lookup from payload key to its
+    converters and field positions. Payloads are "key:value,..." text or a
+    JSON object using the same keys. Unknown keys are logged the first time
+    they are seen and skipped afterwards, the last few of them are kept
+    for that. An idle charger keeps reporting
+    the same text, so the last few text payloads are remembered along with
+    their snapshot. A payload without any known key, such as an error page,
+    raises V2CCloudMalformedResponseError.
+    """
+
+    def __init__(self, recent_size: int = 16, aliases_size: int = 64) -> None:
+        """Compile the schema."""
+        hints = get_type_hints(V2CStatus, include_extras=True)
+        self._defaults = tuple(
+            V2CStatus._field_defaults[name] for name in V2CStatus._fields
+        )
+        positions: dict[str, list[int]] = {}
+        converters = {}
+        for index, name in enumerate(V2CStatus._fields):
+            if (key := getattr(hints[name], "__metadata__", (None,))[0]) is None:
+                continue
+            positions.setdefault(key, []).append(index)
+            converters[key] = _CONVERTERS[hints[name].__origin__]
+        # key -> (convert, fallback, position, other positions fed by the key)
+        self._targets: dict[str, tuple] = {
+            key: (*converters[key], indexes[0], tuple(indexes[1:]))
+            for key, indexes in positions.items()
+        }
+        # Keys not in the schema as is, bounded as the cloud may send any
+        self._aliases: dict[str, tuple] = {}
+        self._aliases_size = aliases_size
+        self._recent: dict[str, V2CStatus] = {}
+        self._recent_size = recent_size
+
+    def parse(self, payload: str | Mapping[str, Any]) -> V2CStatus:
+        """Return the status held by a text or JSON payload."""
+        text = payload if isinstance(payload, str) else None
+        if text is not None:
+            if (status := self._recent.get(text)) is not None:
+                return status
+            if text.lstrip().startswith("{"):
+                try:
+                    payload = json.loads(text)
+                except ValueError:
+                    pass
+
+        is_text = isinstance(payload, str)
+        values = list(self._defaults)
+        targets = self._targets
+        found = False
+        for pair in payload.split(",") if is_text else payload.items():
+            if is_text:
+                key, _, value = pair.partition(":")
+            else:
+                key, value = pair
+            if (target := targets.get(key)) is None:
+                target = self._resolve(key)
+            if not target:
+                continue
+            found = True
+            convert, fallback, index, others = target
+            try:
+                value = convert(value)
+            except (TypeError, ValueError):
+                try:
+                    value = fallback(value)
+                except (TypeError, ValueError):
+                    continue
+                # The cloud sends this key in the slower format, use that first
+                if key in targets:
+                    targets[key] = (fallback, fallback, index, others)
+            values[index] = value
+            for index in others:
+                values[index] = value
+
+        if not found:
+            raise V2CCloudMalformedResponseError(
+                f"No status fields in payload: {str(payload)[:300]}"
+            )
+        status = V2CStatus._make(values)
+        if text is not None:
+            self._remember(text, status)
+        return status
+
+    def _resolve(self, key: str) -> tuple:
+        """Look up a key not found as is, e.g. padded, and remember it.
+
+        Keys missing from the schema are logged when first seen and map to
+        (). The oldest key is dropped once `aliases_size` are remembered.
+        """
+        if (target := self._aliases.get(key)) is not None:
+            return target
+        stripped = key.strip()
+        target = self._targets.get(stripped, ())
+        if not target and stripped:
+            _LOGGER.debug("Ignoring unknown status field %r", stripped)
+        if len(self._aliases) >= self._aliases_size:
+            del self._aliases[next(iter(self._aliases))]
+        self._aliases[key] = target
+        return target
+
+    def _remember(self, text: str, status: V2CStatus) -> None:
+        """Keep the snapshot of a text payload, dropping the oldest one."""
+        if len(self._recent) >= self._recent_size:
+            del self._recent[next(iter(self._recent))]
+        self._recent[text] = status
+
+
+STATUS_PARSER = StatusParser()
+
+
+def parse_status(payload: str | Mapping[str, Any]) -> V2CStatus:
+    """Parse a /device/reported payload."""
+    return STATUS_PARSER.parse(payload)
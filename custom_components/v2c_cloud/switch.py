@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+from functools import partial
 from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
@@ -33,9 +34,20 @@ async def async_setup_entry(
 class V2CCloudSwitch(V2CCloudEntity, SwitchEntity):
     """V2C Cloud switch entity."""
 
+    _unrecorded_attributes = frozenset(
+        key
+        for info in SWITCH_TYPES.values()
+        for key in info.get("static_attributes", ())
+    )
+
     def __init__(self, coordinator, switch_type: str, switch_info: dict[str, Any]):
         """Initialize the switch."""
-        super().__init__(coordinator, switch_type)
+        super().__init__(
+            coordinator,
+            switch_type,
+            switch_info.get("source_fields"),
+            switch_info.get("static_attributes"),
+        )
         self._switch_info = switch_info
         self._attr_icon = switch_info.get("icon")
         
@@ -43,44 +55,23 @@ class V2CCloudSwitch(V2CCloudEntity, SwitchEntity):
         self._attr_translation_key = switch_info.get("translation_key")
         self._attr_has_entity_name = True
 
-    def _safe_bool(self, value: Any, default: bool = False) -> bool:
-        """Safely convert any value to bool."""
-        try:
-            if value is None:
-                return default
-            if isinstance(value, bool):
-                return value
-            if isinstance(value, str):
-                return value.lower() in ("1", "true", "yes", "on")
-            if isinstance(value, (int, float)):
-                return value != 0
-            return default
-        except (ValueError, TypeError):
-            return default
-
-    def _safe_int(self, value: Any, default: int = 0) -> int:
-        """Safely convert any value to int."""
-        try:
-            if value is None:
-                return default
-            return int(float(value))
-        except (ValueError, TypeError):
-            return default
-
     @property
     def is_on(self) -> bool | None:
         """Return True if the switch is on."""
-        if not self.coordinator.data:
-            return None
-            
+        return self._derived.value
+
+    def _compute_value(self) -> bool | None:
+        """Derive the value from the coordinator data."""
         data = self.coordinator.data
-        
+        if data is None:
+            return None
+
         if self._type == "dynamic":
-            return self._safe_bool(data.get("dynamic_power", False))
+            return data.dynamic_power
         elif self._type == "paused":
-            return self._safe_bool(data.get("paused", False))
+            return data.paused
         elif self._type == "locked":
-            return self._safe_bool(data.get("locked", False))
+            return data.locked
         
         return None
 
@@ -88,16 +79,21 @@ class V2CCloudSwitch(V2CCloudEntity, SwitchEntity):
         """Turn the switch on."""
         try:
             success = False
+            api = self.coordinator.api
             if self._type == "dynamic":
-                success = await self.coordinator.api.set_dynamic_power(True)
+                success = await self.coordinator.async_send_command(
+                    partial(api.set_dynamic_power, True), {"dynamic_power": True}
+                )
             elif self._type == "paused":
-                success = await self.coordinator.api.set_paused(True)
+                success = await self.coordinator.async_send_command(
+                    partial(api.set_paused, True), {"paused": True}
+                )
             elif self._type == "locked":
-                success = await self.coordinator.api.set_locked(True)
-            
-            if success:
-                await self.coordinator.async_request_refresh()
-            else:
+                success = await self.coordinator.async_send_command(
+                    partial(api.set_locked, True), {"locked": True}
+                )
+
+            if not success:
                 _LOGGER.error("Failed to turn on %s", self._type)
         except Exception as err:
             _LOGGER.error("Error turning on %s: %s", self._type, err)
@@ -107,49 +103,38 @@ class V2CCloudSwitch(V2CCloudEntity, SwitchEntity):
         """Turn the switch off."""
         try:
             success = False
+            api = self.coordinator.api
             if self._type == "dynamic":
-                success = await self.coordinator.api.set_dynamic_power(False)
+                success = await self.coordinator.async_send_command(
+                    partial(api.set_dynamic_power, False), {"dynamic_power": False}
+                )
             elif self._type == "paused":
-                success = await self.coordinator.api.set_paused(False)
+                success = await self.coordinator.async_send_command(
+                    partial(api.set_paused, False), {"paused": False}
+                )
             elif self._type == "locked":
-                success = await self.coordinator.api.set_locked(False)
-            
-            if success:
-                await self.coordinator.async_request_refresh()
-            else:
+                success = await self.coordinator.async_send_command(
+                    partial(api.set_locked, False), {"locked": False}
+                )
+
+            if not success:
                 _LOGGER.error("Failed to turn off %s", self._type)
         except Exception as err:
             _LOGGER.error("Error turning off %s: %s", self._type, err)
             raise
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any] | None:
-        """Return additional state attributes."""
-        if not self.coordinator.data:
-            return None
-            
+    def _compute_attributes(self) -> dict[str, Any] | None:
+        """Derive the additional state attributes."""
         data = self.coordinator.data
+        if data is None:
+            return None
+
         attributes = {}
-        
-        if self._type == "dynamic":
-            attributes.update({
-                "description": "Enables automatic power adjustment based on available solar power",
-                "requires_solar": True,
-                "compatible_with_emhass": True,
-            })
-        elif self._type == "paused":
-            # FIXED: Safe conversion for charge_state
-            charge_state = self._safe_int(data.get("charge_state", 99))
-            attributes.update({
-                "description": "Temporarily pauses charging without disconnecting",
-                "charge_state": charge_state,
-                "can_resume": charge_state in [1, 4],  # connected_not_charging or paused
-            })
-        elif self._type == "locked":
+
+        if self._type == "paused":
             attributes.update({
-                "description": "Prevents unauthorized use of the charger",
-                "security_feature": True,
-                "requires_unlock_to_charge": True,
+                "charge_state": data.charge_state,
+                "can_resume": data.charge_state in [1, 4],  # connected_not_charging or paused
             })
-        
+
         return attributes if attributes else None
\ No newline at end of file
@@ -2,17 +2,67 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import time
+from functools import partial
 from typing import Any
+from urllib.parse import urlsplit
 
 import aiohttp
 import async_timeout
 
-from .const import API_BASE_URL, API_TIMEOUT, API_RETRIES
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson ships with Home Assistant, fall back without it
+    from json import loads as json_loads
+
+from .cassette import CassetteRecorder
+from .const import (
+    API_BASE_URL,
+    API_CONNECT_TIMEOUT,
+    API_RESULT_REUSE_WINDOW,
+    API_TIMEOUT,
+    API_RETRIES,
+    API_RETRY_BACKOFF_BASE,
+    API_RETRY_BACKOFF_MAX,
+)
+from .exceptions import (
+    V2CCloudAuthError,
+    V2CCloudError,
+    V2CCloudMalformedResponseError,
+    V2CCloudNotFoundError,
+    V2CCloudRateLimitError,
+    V2CCloudTransientError,
+)
+from .history import EVENT_COMMAND, EVENT_PARSE, EVENT_REQUEST, RequestHistory
+from .metrics import OUTCOME_ERROR, OUTCOME_SUCCESS, OUTCOME_TIMEOUT, ApiMetrics
+from .profiler import (
+    STAGE_BODY_READ,
+    STAGE_NETWORK,
+    STAGE_PARSE,
+    STAGE_QUEUE_WAIT,
+    CycleProfiler,
+)
+from .retry import (
+    RETRY_AFTER_STATUSES,
+    RETRY_STATUSES,
+    backoff_delay,
+    get_circuit_breaker,
+    parse_retry_after,
+)
+from .scheduler import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    PRIORITY_REFRESH,
+    RequestScheduler,
+)
+from .singleflight import SingleFlight
+from .status import V2CStatus, parse_status
 
 _LOGGER = logging.getLogger(__name__)
 
+STATUS_ENDPOINT = "/device/reported"
+
 
 class V2CCloudAPI:
     """V2C Cloud API client using official Swagger endpoints."""
@@ -22,11 +72,38 @@ class V2CCloudAPI:
         session: aiohttp.ClientSession,
         api_token: str,
         device_id: str,
+        scheduler: RequestScheduler | None = None,
+        single_flight: SingleFlight | None = None,
+        timeout: float = API_TIMEOUT,
+        base_url: str | None = None,
+        recorder: CassetteRecorder | None = None,
     ) -> None:
-        """Initialize the API client."""
+        """Initialize the API client.
+
+        Clients of the same account share `scheduler` and `single_flight`.
+        `timeout` bounds each attempt, connecting gets API_CONNECT_TIMEOUT
+        of it at most. `base_url` replaces API_BASE_URL, e.g. to talk to
+        scripts/mock_cloud.py. Every attempt is recorded to `recorder`, and
+        a CassetteSession in place of `session` replays a recording.
+        """
         self._session = session
         self._api_token = api_token
         self._device_id = device_id
+        self._scheduler = scheduler
+        self._single_flight = single_flight or SingleFlight(API_RESULT_REUSE_WINDOW)
+        self._base_url = base_url or API_BASE_URL
+        self._breaker = get_circuit_breaker(urlsplit(self._base_url).netloc)
+        self._timeout = timeout
+        self._recorder = recorder
+        # Per endpoint counters and latencies of every attempt, and the
+        # last ones in detail
+        self.metrics = ApiMetrics()
+        self.history = RequestHistory()
+        # Set by the account while the profile service runs
+        self.profiler: CycleProfiler | None = None
+        self._client_timeout = aiohttp.ClientTimeout(
+            sock_connect=min(API_CONNECT_TIMEOUT, timeout), sock_read=timeout
+        )
         # CORRECT: apikey header as per Swagger documentation
         self._headers = {
             "apikey": api_token,
@@ -41,53 +118,212 @@ class V2CCloudAPI:
         endpoint: str,
         params: dict[str, Any] | None = None,
         data: dict[str, Any] | None = None,
-    ) -> dict[str, Any] | None:
-        """Make a request to the V2C Cloud API."""
-        url = f"{API_BASE_URL}{endpoint}"
-        
-        _LOGGER.debug("Making %s request to %s", method, url)
-        _LOGGER.debug("Params: %s", params)
-        
-        try:
-            async with async_timeout.timeout(API_TIMEOUT):
-                async with self._session.request(
-                    method, url, headers=self._headers, params=params, json=data
-                ) as response:
-                    _LOGGER.debug("Response status: %s", response.status)
-                    
-                    # Get response text first
-                    response_text = await response.text()
-                    _LOGGER.debug("Response text (first 300 chars): %s", response_text[:300])
-                    
-                    if response.status == 200:
-                        # V2C API sometimes returns plain text, sometimes JSON
-                        content_type = response.headers.get('content-type', '')
-                        _LOGGER.debug("Content-Type: %s", content_type)
-                        
-                        if 'json' in content_type:
-                            try:
-                                response_data = json.loads(response_text)
-                                return response_data
-                            except json.JSONDecodeError:
-                                # If JSON parsing fails, return as text
-                                return {"response": response_text}
+        priority: int = PRIORITY_COMMAND,
+        idempotent: bool | None = None,
+    ) -> dict[str, Any] | list[Any]:
+        """Make a request to the V2C Cloud API.
+
+        Concurrent identical GETs share one request and its parsed result.
+        Any other call invalidates the shared results once it completes.
+        Failures raise a V2CCloudError subclass, see exceptions.py.
+        """
+        if method != "GET":
+            started = time.monotonic()
+            value = params.get("value") if params else None
+            try:
+                response = await self._send_request(
+                    method, endpoint, params, data, priority, idempotent
+                )
+            except V2CCloudError as err:
+                self.history.add_event(
+                    EVENT_COMMAND, endpoint, type(err).__name__,
+                    time.monotonic() - started, value,
+                )
+                raise
+            finally:
+                self._single_flight.forget()
+            self.history.add_event(
+                EVENT_COMMAND, endpoint, "ok", time.monotonic() - started, value
+            )
+            return response
+
+        key = (endpoint, tuple(sorted(params.items())) if params else ())
+        return await self._single_flight.do(
+            key,
+            partial(
+                self._send_request, method, endpoint, params, data, priority, idempotent
+            ),
+        )
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        data: dict[str, Any] | None,
+        priority: int,
+        idempotent: bool | None,
+    ) -> dict[str, Any] | list[Any]:
+        """Send a request, retrying it if it is idempotent.
+
+        Idempotent calls (GET by default) are retried with exponential backoff
+        on timeouts, connection errors and 429/5xx responses. The error of the
+        last attempt is raised once retries are exhausted.
+        """
+        url = f"{self._base_url}{endpoint}"
+        if idempotent is None:
+            idempotent = method == "GET"
+        attempts = API_RETRIES + 1 if idempotent else 1
+
+        profiler = self.profiler
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            _LOGGER.debug("Making %s request to %s, params %s", method, url, params)
+
+        for attempt in range(attempts):
+            if not self._breaker.allow_request():
+                raise V2CCloudTransientError(
+                    f"Circuit open, {method} {endpoint} not sent"
+                )
+
+            retry_after: float | None = None
+            started: float | None = None
+            try:
+                if self._scheduler is not None:
+                    queued = time.monotonic()
+                    await self._scheduler.acquire(priority)
+                    if profiler is not None:
+                        profiler.add(STAGE_QUEUE_WAIT, time.monotonic() - queued)
+                started = time.monotonic()
+
+                async with async_timeout.timeout(self._timeout):
+                    async with self._session.request(
+                        method,
+                        url,
+                        headers=self._headers,
+                        params=params,
+                        json=data,
+                        timeout=self._client_timeout,
+                    ) as response:
+                        headers_at = time.monotonic()
+                        body = await response.read()
+                        elapsed = time.monotonic() - started
+                        if profiler is not None:
+                            profiler.add(STAGE_NETWORK, headers_at - started)
+                            profiler.add(
+                                STAGE_BODY_READ, started + elapsed - headers_at
+                            )
+                        self.metrics.record(
+                            endpoint,
+                            elapsed,
+                            OUTCOME_SUCCESS
+                            if response.status == 200
+                            else OUTCOME_ERROR,
+                            len(body),
+                        )
+                        self.history.add_event(
+                            EVENT_REQUEST, endpoint, response.status, elapsed
+                        )
+                        if endpoint == STATUS_ENDPOINT:
+                            self.history.add_payload(response.status, body)
+                        if self._recorder is not None:
+                            self._recorder.record(
+                                method, endpoint, params, started,
+                                response.status, body,
+                                _recorded_headers(response.headers),
+                            )
+                        if debug:
+                            _LOGGER.debug(
+                                "Response status %s: %r", response.status, body[:300]
+                            )
+
+                        if response.status == 200:
+                            self._breaker.record_success()
+                            return decode_body(body)
+
+                        message = (
+                            f"{method} {endpoint} failed with status "
+                            f"{response.status}: "
+                            f"{body[:300].decode('utf-8', 'replace')}"
+                        )
+                        if response.status not in RETRY_STATUSES:
+                            # The host answered, the request itself is wrong
+                            self._breaker.record_success()
+                            raise _status_error(response.status, message)
+
+                        if response.status != 429:
+                            self._breaker.record_failure()
+                        if response.status in RETRY_AFTER_STATUSES:
+                            retry_after = parse_retry_after(
+                                response.headers.get("Retry-After")
+                            )
+                        if response.status == 429:
+                            error: V2CCloudError = V2CCloudRateLimitError(
+                                message, retry_after
+                            )
                         else:
-                            # V2C often returns plain text responses
-                            return {"response": response_text, "status": "success"}
-                    else:
-                        _LOGGER.error("Request failed with status %s: %s", response.status, response_text[:300])
-                        return None
-                        
-        except Exception as err:
-            _LOGGER.error("Request error: %s", err)
-            return None
+                            error = V2CCloudTransientError(message)
+
+            except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+                self._breaker.record_failure()
+                if started is not None:
+                    outcome = (
+                        OUTCOME_TIMEOUT if isinstance(err, asyncio.TimeoutError)
+                        else OUTCOME_ERROR
+                    )
+                    elapsed = time.monotonic() - started
+                    self.metrics.record(endpoint, elapsed, outcome)
+                    self.history.add_event(EVENT_REQUEST, endpoint, outcome, elapsed)
+                    if self._recorder is not None:
+                        self._recorder.record(
+                            method, endpoint, params, started, failure=outcome
+                        )
+                error = V2CCloudTransientError(
+                    f"{method} {endpoint} failed: {str(err) or type(err).__name__}"
+                )
+                error.__cause__ = err
+
+            if attempt + 1 == attempts:
+                break
+            delay = retry_after
+            if delay is None:
+                delay = backoff_delay(
+                    attempt, API_RETRY_BACKOFF_BASE, API_RETRY_BACKOFF_MAX
+                )
+            elif delay > API_RETRY_BACKOFF_MAX:
+                _LOGGER.debug("Retry-After of %ss is too long, giving up", delay)
+                break
+            _LOGGER.debug(
+                "Attempt %s/%s of %s %s failed (%s), retrying in %.1fs",
+                attempt + 1, attempts, method, endpoint, error, delay,
+            )
+            await asyncio.sleep(delay)
+
+        raise error
+
+    @property
+    def device_id(self) -> str:
+        """Return the device ID this client talks to."""
+        return self._device_id
+
+    async def get_pairings(self) -> list[dict[str, Any]]:
+        """Get every device paired to this API token using /pairings/me."""
+        endpoint = "/pairings/me"
+        response = await self._request("GET", endpoint, priority=PRIORITY_REFRESH)
+
+        if isinstance(response, list):
+            return [device for device in response if isinstance(device, dict)]
+
+        raise V2CCloudMalformedResponseError(
+            f"Unexpected pairings response: {str(response)[:300]}"
+        )
 
     async def get_device_info(self) -> dict[str, Any] | None:
         """Get device information using /pairings/me endpoint."""
         # First check if device exists in our pairings
         endpoint = "/pairings/me"
-        response = await self._request("GET", endpoint)
-        
+        response = await self._request("GET", endpoint, priority=PRIORITY_REFRESH)
+
         if response and isinstance(response, list):
             # Find our device in the pairings list
             for device in response:
@@ -101,72 +337,33 @@ class V2CCloudAPI:
         
         return None
 
-    async def get_device_status(self) -> dict[str, Any] | None:
+    async def get_device_status(self, priority: int = PRIORITY_POLL) -> V2CStatus:
         """Get current device status using /device/reported endpoint."""
         # CORRECT: Use /device/reported to get all device values
-        endpoint = "/device/reported"
         params = {"deviceId": self._device_id}
-        response = await self._request("GET", endpoint, params=params)
-        
-        if response:
-            _LOGGER.debug("Raw device status response: %s", response)
-            
-            # Parse the response - V2C returns different formats
-            if isinstance(response, dict) and "response" in response:
-                # Try to parse the text response
-                response_text = response["response"]
-                
-                # V2C often returns key-value pairs in text format
-                # Example: "intensity:16,dynamic:1,connected:1,state:2"
-                parsed_data = {}
-                if ":" in response_text:
-                    try:
-                        # Parse comma-separated key:value pairs
-                        pairs = response_text.split(",")
-                        for pair in pairs:
-                            if ":" in pair:
-                                key, value = pair.split(":", 1)
-                                parsed_data[key.strip()] = value.strip()
-                    except Exception as e:
-                        _LOGGER.debug("Could not parse response text: %s", e)
-                        parsed_data = {"raw_response": response_text}
-                else:
-                    parsed_data = {"raw_response": response_text}
-                
-                # Transform to expected format for EMHASS compatibility
-                return {
-                    "charge_power": self._safe_int(parsed_data.get("power", "0")),
-                    "charge_energy": self._safe_int(parsed_data.get("energy", "0")),
-                    "charge_state": self._safe_int(parsed_data.get("state", "99")),
-                    "charge_current": self._safe_int(parsed_data.get("intensity", "0")),
-                    "voltage": self._safe_int(parsed_data.get("voltage", "230")),
-                    "temperature": self._safe_int(parsed_data.get("temperature", "0")),
-                    "session_energy": self._safe_int(parsed_data.get("session_energy", "0")),
-                    "session_time": self._safe_int(parsed_data.get("session_time", "0")),
-                    "total_energy": self._safe_int(parsed_data.get("total_energy", "0")),
-                    "wifi_signal": self._safe_int(parsed_data.get("wifi_signal", "-50")),
-                    "firmware_version": parsed_data.get("firmware", "Unknown"),
-                    "intensity": self._safe_int(parsed_data.get("intensity", "6")),
-                    "max_intensity": self._safe_int(parsed_data.get("max_intensity", "32")),
-                    "min_intensity": self._safe_int(parsed_data.get("min_intensity", "6")),
-                    "dynamic_power": parsed_data.get("dynamic", "0") == "1",
-                    "paused": parsed_data.get("paused", "0") == "1",
-                    "locked": parsed_data.get("locked", "0") == "1",
-                    "last_updated": "",
-                    "raw_data": parsed_data,  # For debugging
-                }
-            else:
-                # If it's already a dict, use it directly
-                return response
-        
-        return None
+        response = await self._request(
+            "GET", STATUS_ENDPOINT, params=params, priority=priority
+        )
 
-    def _safe_int(self, value: str) -> int:
-        """Safely convert string to int."""
         try:
-            return int(float(value))
-        except (ValueError, TypeError):
-            return 0
+            if not isinstance(response, dict):
+                raise V2CCloudMalformedResponseError(
+                    f"Unexpected device status response: {str(response)[:300]}"
+                )
+            # V2C usually answers with "key:value,key:value" text, JSON
+            # objects use the same keys
+            parse_started = time.monotonic()
+            status = parse_status(response.get("response", response))
+            if self.profiler is not None:
+                self.profiler.add(STAGE_PARSE, time.monotonic() - parse_started)
+        except V2CCloudMalformedResponseError as err:
+            self.history.add_event(EVENT_PARSE, STATUS_ENDPOINT, "malformed", None, err)
+            raise
+        self.history.add_event(EVENT_PARSE, STATUS_ENDPOINT, "ok")
+        return status
+
+    # Setters sending an absolute value are safe to retry, toggles such as
+    # startcharge, pausecharge and reboot are not.
 
     async def set_intensity(self, intensity: int) -> bool:
         """Set charging intensity using /device/intensity endpoint."""
@@ -175,7 +372,9 @@ class V2CCloudAPI:
             "deviceId": self._device_id,
             "value": str(intensity)
         }
-        response = await self._request("POST", endpoint, params=params)
+        response = await self._request(
+            "POST", endpoint, params=params, idempotent=True
+        )
         return response is not None
 
     async def start_charging(self) -> bool:
@@ -199,7 +398,9 @@ class V2CCloudAPI:
             "deviceId": self._device_id,
             "value": "1" if enabled else "0"
         }
-        response = await self._request("POST", endpoint, params=params)
+        response = await self._request(
+            "POST", endpoint, params=params, idempotent=True
+        )
         return response is not None
 
     async def set_paused(self, paused: bool) -> bool:
@@ -217,7 +418,9 @@ class V2CCloudAPI:
             "deviceId": self._device_id,
             "value": "1" if locked else "0"
         }
-        response = await self._request("POST", endpoint, params=params)
+        response = await self._request(
+            "POST", endpoint, params=params, idempotent=True
+        )
         return response is not None
 
     async def restart_device(self) -> bool:
@@ -232,4 +435,39 @@ class V2CCloudAPI:
         # V2C doesn't appear to have a session reset endpoint in the Swagger
         # This might need to be implemented differently or might not be available
         _LOGGER.warning("Session reset not available in V2C API")
-        return False
\ No newline at end of file
+        return False
+
+
+def decode_body(body: bytes) -> dict[str, Any] | list[Any]:
+    """Decode a successful response body.
+
+    V2C answers with JSON or "key:value" text whatever the Content-Type says,
+    so the first byte that is not whitespace decides. Text is returned as
+    {"response": text}.
+    """
+    # One byte slices are cached by CPython, only padded bodies are copied
+    first = body[:1]
+    if first.isspace():
+        first = body.lstrip()[:1]
+    if first in (b"{", b"["):
+        try:
+            return json_loads(body)
+        except ValueError:
+            pass
+    return {"response": body.decode("utf-8", "replace"), "status": "success"}
+
+
+def _recorded_headers(headers) -> dict[str, str] | None:
+    """Return the response headers _send_request reads, for a cassette."""
+    if (retry_after := headers.get("Retry-After")) is not None:
+        return {"Retry-After": retry_after}
+    return None
+
+
+def _status_error(status: int, message: str) -> V2CCloudError:
+    """Return the error for a response that is not worth retrying."""
+    if status in (401, 403):
+        return V2CCloudAuthError(message)
+    if status == 404:
+        return V2CCloudNotFoundError(message)
+    return V2CCloudError(message)
@@ -0,0 +1,145 @@
+"""Microbenchmark of the response body handling in V2CCloudAPI._send_request.
+
+Compares reading the body as text, slicing it for the debug log and decoding
+JSON from the string, as _send_request used to, with reading bytes once and
+decoding them with decode_body. Both run on real aiohttp responses served
+locally, with debug logging off as in production, and report CPU time and
+peak memory allocated per request.
+
+    python scripts/bench_decode.py [-n NUMBER] [-r REPEAT]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+import tracemalloc
+
+import aiohttp
+from aiohttp import web
+
+from bench_parser import JSON_PAYLOAD, TEXT_PAYLOAD, load_module
+
+_LOGGER = logging.getLogger("bench_decode")
+
+PAIRINGS = json.dumps([
+    {"deviceId": f"DEVICE{index}", "tag": f"Charger {index}", "model": "Trydan"}
+    for index in range(3)
+])
+
+# name -> (body, content type sent by the server)
+RESPONSES = {
+    "text/plain reported": (TEXT_PAYLOAD, "text/plain"),
+    "json reported": (JSON_PAYLOAD, "application/json"),
+    "json pairings": (PAIRINGS, "application/json"),
+}
+
+
+async def legacy_handle(response: aiohttp.ClientResponse):
+    """The body handling _send_request did before decode_body."""
+    _LOGGER.debug("Response status: %s", response.status)
+    response_text = await response.text()
+    _LOGGER.debug("Response text (first 300 chars): %s", response_text[:300])
+    content_type = response.headers.get("content-type", "")
+    _LOGGER.debug("Content-Type: %s", content_type)
+    if "json" in content_type:
+        try:
+            return json.loads(response_text)
+        except json.JSONDecodeError:
+            return {"response": response_text}
+    return {"response": response_text, "status": "success"}
+
+
+def make_handler(decode_body):
+    """Return the current body handling of _send_request."""
+
+    async def handle(response: aiohttp.ClientResponse):
+        body = await response.read()
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Response status %s: %r", response.status, body[:300])
+        return decode_body(body)
+
+    return handle
+
+
+async def measure(handle, response, number: int) -> tuple[float, float]:
+    """Return CPU microseconds and peak bytes allocated per handled response."""
+    start = time.process_time()
+    for _ in range(number):
+        await handle(response)
+    cpu = (time.process_time() - start) / number * 1e6
+
+    tracemalloc.start()
+    peak = 0
+    for _ in range(min(number, 1000)):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await handle(response)
+        peak += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return cpu, peak / min(number, 1000)
+
+
+async def run(number: int, repeat: int) -> None:
+    """Fetch each response once and time both handlers on it."""
+    v2c_api = load_module("v2c_api")
+    handlers = {
+        "legacy": legacy_handle,
+        "bytes": make_handler(v2c_api.decode_body),
+    }
+    print(f"json decoder: {v2c_api.json_loads.__module__}")
+
+    app = web.Application()
+    for path, (body, content_type) in enumerate(RESPONSES.values()):
+        app.router.add_get(
+            f"/{path}",
+            lambda _request, body=body, content_type=content_type: web.Response(
+                body=body.encode(), headers={"Content-Type": content_type}
+            ),
+        )
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    async with aiohttp.ClientSession() as session:
+        for path, name in enumerate(RESPONSES):
+            async with session.get(f"http://127.0.0.1:{port}/{path}") as response:
+                await response.read()
+                results = [await handler(response) for handler in handlers.values()]
+                assert results[0] == results[1], name
+
+                best = {handler: (float("inf"), 0.0) for handler in handlers}
+                for _ in range(repeat):
+                    for handler_name, handler in handlers.items():
+                        cpu, peak = await measure(handler, response, number)
+                        best[handler_name] = (
+                            min(best[handler_name][0], cpu), peak
+                        )
+
+            baseline = best["legacy"][0]
+            for handler_name, (cpu, peak) in best.items():
+                print(
+                    f"{name:<20} {handler_name:<7} {cpu:7.2f} us/request  "
+                    f"{baseline / cpu:5.2f}x  {peak:6.0f} bytes peak"
+                )
+
+    await runner.cleanup()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=20_000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+    asyncio.run(run(args.number, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Fleet load benchmark: N simulated chargers against one Home Assistant.
+
+For each fleet size the mock cloud (scripts/mock_cloud.py) runs in its own
+process and a fresh Home Assistant with one config entry per charger runs in
+another, so neither the server nor earlier runs show up in the numbers. Once
+every entry is set up and a warm-up period has passed it measures, over
+`--duration` seconds:
+
+- polls/s: charger polls completed, against the N / interval expected
+- loop lag: how late a task sleeping 50 ms wakes up, p50/p99/max in ms
+- CPU/poll: process CPU time per poll, less what HA and the lag probe
+  use idle (measured before the entries are set up)
+- mem/device: RSS growth from setting up the entries, per charger
+- writes/s: state_changed events per second
+
+The V2C Cloud allows one request per second per token, so the chargers are
+spread over accounts of `--per-account`, like several households would be.
+
+    python scripts/bench_fleet.py [--sizes 1,10,100,500] [--duration S]
+        [--interval S] [--latency S] [--output FILE] [--baseline FILE]
+
+With --baseline the results are compared with an earlier --output, and the
+exit status is 1 if a metric got worse by more than --tolerance.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPTS_DIR.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from homeassistant.config_entries import ConfigEntryState  # noqa: E402
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+
+from custom_components.v2c_cloud.const import (  # noqa: E402
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
+)
+from custom_components.v2c_cloud.coordinator import (  # noqa: E402
+    V2CCloudDataUpdateCoordinator,
+)
+from mock_cloud import fleet_token  # noqa: E402
+from offline_harness import async_add_chargers, async_start_hass  # noqa: E402
+
+LAG_PROBE_INTERVAL = 0.05
+IDLE_MEASUREMENT = 5.0
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+# metric -> (column header, format)
+METRICS = {
+    "polls_per_second": ("polls/s", "{:8.1f}"),
+    "expected_polls_per_second": ("expected", "{:8.1f}"),
+    "lag_p50_ms": ("lag p50", "{:8.2f}"),
+    "lag_p99_ms": ("lag p99", "{:8.2f}"),
+    "lag_max_ms": ("lag max", "{:8.2f}"),
+    "cpu_per_poll_ms": ("CPU/poll", "{:8.3f}"),
+    "memory_per_device_kb": ("KB/dev", "{:8.1f}"),
+    "writes_per_second": ("writes/s", "{:8.1f}"),
+    "setup_seconds": ("setup s", "{:8.2f}"),
+}
+# Compared with --baseline, the others depend on the fleet size only
+REGRESSION_METRICS = ("lag_p99_ms", "cpu_per_poll_ms", "memory_per_device_kb")
+
+
+def _rss() -> int:
+    """Return the resident set size of this process in bytes."""
+    with open("/proc/self/statm", encoding="ascii") as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile, 0 for no values."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+async def _probe_lag(lags: list[float]) -> None:
+    """Record how late every 50 ms sleep wakes up, in seconds."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lags.append(loop.time() - start - LAG_PROBE_INTERVAL)
+
+
+async def _start_cloud(args: argparse.Namespace, size: int):
+    """Start scripts/mock_cloud.py for `size` chargers, return it and its URL."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, str(SCRIPTS_DIR / "mock_cloud.py"),
+        "--devices", str(size),
+        "--per-account", str(args.per_account),
+        "--port", "0",
+        "--latency", str(args.latency),
+        "--jitter", str(args.latency / 2),
+        stdout=subprocess.PIPE,
+    )
+    line = (await process.stdout.readline()).decode()
+    if " at " not in line:
+        process.kill()
+        raise RuntimeError(f"Mock cloud did not start: {line!r}")
+    return process, line.rsplit(" at ", 1)[1].strip()
+
+
+async def run_size(args: argparse.Namespace, size: int) -> dict[str, float]:
+    """Set up `size` chargers, let them poll and return the metrics."""
+    process, url = await _start_cloud(args, size)
+    # mock_cloud.py names them MOCK0000... and spreads them with add_fleet
+    chargers = [
+        (fleet_token(index // args.per_account), f"MOCK{index:04d}")
+        for index in range(size)
+    ]
+    options = dict.fromkeys(
+        (CONF_FAST_SCAN_INTERVAL, CONF_SCAN_INTERVAL, CONF_SLOW_SCAN_INTERVAL),
+        args.interval,
+    )
+
+    polls = 0
+    schedule_next_poll = V2CCloudDataUpdateCoordinator.schedule_next_poll
+    schedule_retry = V2CCloudDataUpdateCoordinator.schedule_retry
+
+    def count_poll(method):
+        def counted(self, *call_args):
+            nonlocal polls
+            polls += 1
+            return method(self, *call_args)
+
+        return counted
+
+    # Every poll ends in one of these, successful or not
+    V2CCloudDataUpdateCoordinator.schedule_next_poll = count_poll(schedule_next_poll)
+    V2CCloudDataUpdateCoordinator.schedule_retry = count_poll(schedule_retry)
+
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            hass = await async_start_hass(config_dir)
+
+            lags: list[float] = []
+            probe = asyncio.create_task(_probe_lag(lags))
+            cpu_start, start = time.process_time(), time.perf_counter()
+            await asyncio.sleep(IDLE_MEASUREMENT)
+            idle_cpu_rate = (time.process_time() - cpu_start) / (
+                time.perf_counter() - start
+            )
+            probe.cancel()
+
+            rss_before = _rss()
+            start = time.perf_counter()
+            entries = await async_add_chargers(hass, url, chargers, options)
+            setup_seconds = time.perf_counter() - start
+            memory = _rss() - rss_before
+            failed = [
+                entry for entry in entries
+                if entry.state is not ConfigEntryState.LOADED
+            ]
+            if failed:
+                print(f"  {len(failed)} entries failed to set up", file=sys.stderr)
+
+            await asyncio.sleep(args.warmup)
+
+            writes = 0
+
+            def _count_write(_event) -> None:
+                nonlocal writes
+                writes += 1
+
+            unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+            lags = []
+            probe = asyncio.create_task(_probe_lag(lags))
+            polls = 0
+            cpu_start, start = time.process_time(), time.perf_counter()
+            await asyncio.sleep(args.duration)
+            elapsed = time.perf_counter() - start
+            cpu = time.process_time() - cpu_start - idle_cpu_rate * elapsed
+            probe.cancel()
+            unsub()
+
+            for entry in entries:
+                await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_stop(force=True)
+    finally:
+        V2CCloudDataUpdateCoordinator.schedule_next_poll = schedule_next_poll
+        V2CCloudDataUpdateCoordinator.schedule_retry = schedule_retry
+        process.terminate()
+        await process.wait()
+
+    return {
+        "devices": size,
+        "polls_per_second": polls / elapsed,
+        "expected_polls_per_second": size / args.interval,
+        "lag_p50_ms": statistics.median(lags) * 1000 if lags else 0.0,
+        "lag_p99_ms": _percentile(lags, 99) * 1000,
+        "lag_max_ms": max(lags, default=0.0) * 1000,
+        "cpu_per_poll_ms": max(cpu, 0.0) / polls * 1000 if polls else 0.0,
+        "memory_per_device_kb": memory / size / 1024,
+        "writes_per_second": writes / elapsed,
+        "setup_seconds": setup_seconds,
+    }
+
+
+def _run_child(args: argparse.Namespace, size: int) -> dict[str, float]:
+    """Benchmark one fleet size in a fresh interpreter."""
+    command = [
+        sys.executable, __file__, "--child", str(size),
+        "--duration", str(args.duration),
+        "--warmup", str(args.warmup),
+        "--interval", str(args.interval),
+        "--latency", str(args.latency),
+        "--per-account", str(args.per_account),
+    ]
+    output = subprocess.run(
+        command, check=True, stdout=subprocess.PIPE, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def _print_header() -> None:
+    """Print the column headers."""
+    print(f"{'devices':>8} " + " ".join(
+        f"{header:>8}" for header, _ in METRICS.values()
+    ))
+
+
+def _print_row(result: dict[str, float]) -> None:
+    """Print the metrics of one fleet size."""
+    print(f"{result['devices']:>8} " + " ".join(
+        fmt.format(result[metric]) for metric, (_, fmt) in METRICS.items()
+    ), flush=True)
+
+
+def _compare(
+    results: list[dict[str, float]], baseline_path: str, tolerance: float
+) -> bool:
+    """Print the changes against a baseline, return False on a regression."""
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = {result["devices"]: result for result in json.load(baseline_file)}
+
+    passed = True
+    for result in results:
+        if (previous := baseline.get(result["devices"])) is None:
+            continue
+        for metric in REGRESSION_METRICS:
+            before, after = previous[metric], result[metric]
+            if before <= 0:
+                continue
+            change = (after - before) / before
+            regressed = change > tolerance
+            passed &= not regressed
+            print(
+                f"{result['devices']:>5} devices {metric:<22} "
+                f"{before:9.3f} -> {after:9.3f} ({change:+.0%})"
+                f"{'  REGRESSION' if regressed else ''}"
+            )
+    return passed
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", default="1,10,100,500", help="comma separated fleet sizes"
+    )
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=10.0)
+    parser.add_argument("--interval", type=int, default=10, help="poll interval")
+    parser.add_argument("--latency", type=float, default=0.05, help="mock latency")
+    parser.add_argument("--per-account", type=int, default=5)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with an earlier --output")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="relative increase reported as a regression",
+    )
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    if args.child:
+        print(json.dumps(asyncio.run(run_size(args, args.child))))
+        return
+
+    results = []
+    _print_header()
+    for size in (int(size) for size in args.sizes.split(",")):
+        results.append(_run_child(args, size))
+        _print_row(results[-1])
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+    if args.baseline and not _compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
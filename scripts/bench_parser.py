@@ -0,0 +1,146 @@
+"""Microbenchmark of the /device/reported payload parser.
+
+Compares the dict based parsing that get_device_status used to do with the
+compiled StatusParser, for text and JSON payloads, in time per payload and
+memory held per snapshot.
+
+    python scripts/bench_parser.py [-n NUMBER] [-r REPEAT]
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import sys
+import timeit
+import tracemalloc
+import types
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "v2c_cloud"
+
+
+def load_module(name: str) -> types.ModuleType:
+    """Import a module of the integration without running its __init__."""
+    if "v2c_cloud" not in sys.modules:
+        package = types.ModuleType("v2c_cloud")
+        package.__path__ = [str(PACKAGE_DIR)]
+        sys.modules["v2c_cloud"] = package
+    return importlib.import_module(f"v2c_cloud.{name}")
+
+
+TEXT_PAYLOAD = (
+    "power:7360,energy:12.5,state:2,intensity:32,voltage:230,temperature:31,"
+    "session_energy:12500,session_time:5400,total_energy:2345678,"
+    "wifi_signal:-61,dynamic:1,paused:0,locked:0,firmware:2.1.7,"
+    "max_intensity:32,min_intensity:6,timer:0,contracted_power:4600"
+)
+JSON_PAYLOAD = json.dumps(
+    dict(pair.split(":", 1) for pair in TEXT_PAYLOAD.split(","))
+)
+
+
+def _safe_int(value: str) -> int:
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return 0
+
+
+def legacy_parse(response_text: str) -> dict:
+    """The parsing get_device_status did before StatusParser."""
+    parsed_data = {}
+    if ":" in response_text:
+        for pair in response_text.split(","):
+            if ":" in pair:
+                key, value = pair.split(":", 1)
+                parsed_data[key.strip()] = value.strip()
+    else:
+        parsed_data = {"raw_response": response_text}
+    return {
+        "charge_power": _safe_int(parsed_data.get("power", "0")),
+        "charge_energy": _safe_int(parsed_data.get("energy", "0")),
+        "charge_state": _safe_int(parsed_data.get("state", "99")),
+        "charge_current": _safe_int(parsed_data.get("intensity", "0")),
+        "voltage": _safe_int(parsed_data.get("voltage", "230")),
+        "temperature": _safe_int(parsed_data.get("temperature", "0")),
+        "session_energy": _safe_int(parsed_data.get("session_energy", "0")),
+        "session_time": _safe_int(parsed_data.get("session_time", "0")),
+        "total_energy": _safe_int(parsed_data.get("total_energy", "0")),
+        "wifi_signal": _safe_int(parsed_data.get("wifi_signal", "-50")),
+        "intensity": _safe_int(parsed_data.get("intensity", "6")),
+        "dynamic_power": parsed_data.get("dynamic", "0") == "1",
+        "paused": parsed_data.get("paused", "0") == "1",
+        "locked": parsed_data.get("locked", "0") == "1",
+        "last_updated": "",
+        "raw_data": parsed_data,
+        "firmware_version": parsed_data.get("firmware", "Unknown"),
+        "max_intensity": _safe_int(parsed_data.get("max_intensity", "32")),
+        "min_intensity": _safe_int(parsed_data.get("min_intensity", "6")),
+    }
+
+
+def retained_bytes(parse, payloads: list[str]) -> float:
+    """Return the memory held per snapshot when every snapshot is kept."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    snapshots = [parse(payload) for payload in payloads]
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del snapshots
+    return held / len(payloads)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=20_000)
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    status = load_module("status")
+
+    # Both parsers must agree on every field they share
+    legacy = legacy_parse(TEXT_PAYLOAD)
+    compiled = status.parse_status(TEXT_PAYLOAD)
+    for name in compiled._fields:
+        assert getattr(compiled, name) == legacy[name], name
+    assert status.parse_status(json.loads(JSON_PAYLOAD)) == compiled
+
+    # A different power reading on every poll defeats the repeat cache
+    unique = [
+        TEXT_PAYLOAD.replace("power:7360", f"power:{power}")
+        for power in range(args.number)
+    ]
+    cases = {
+        "legacy text": (legacy_parse, unique),
+        "compiled text": (status.parse_status, unique),
+        "repeated text": (status.parse_status, [TEXT_PAYLOAD] * args.number),
+        "compiled json": (status.parse_status, [
+            dict(pair.split(":", 1) for pair in payload.split(","))
+            for payload in unique
+        ]),
+    }
+
+    # Rounds are interleaved so load on the machine hits every case alike
+    best = dict.fromkeys(cases, float("inf"))
+    for _ in range(args.repeat):
+        for name, (parse, payloads) in cases.items():
+            seconds = timeit.timeit(
+                lambda: [parse(payload) for payload in payloads], number=1
+            )
+            best[name] = min(best[name], seconds / len(payloads) * 1e6)
+
+    baseline = best["legacy text"]
+    for name, per_payload in best.items():
+        print(
+            f"{name:<14} {per_payload:7.2f} us/payload  "
+            f"{baseline / per_payload:6.2f}x"
+        )
+
+    for name, parse in (("legacy", legacy_parse), ("compiled", status.parse_status)):
+        print(f"{name:<14} {retained_bytes(parse, unique[:1000]):7.0f} bytes/snapshot")
+
+
+if __name__ == "__main__":
+    main()
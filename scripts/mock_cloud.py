@@ -0,0 +1,342 @@
+"""Local stand-in for the V2C Cloud API.
+
+Serves /pairings/me, /device/reported (as "key:value" text or JSON) and the
+command endpoints for simulated chargers, with configurable latency, error
+rate and 429 responses. The offline harness and the benchmarks start it in
+process, it also runs on its own:
+
+    python scripts/mock_cloud.py [--devices N] [--port PORT] [--latency S]
+        [--error-rate P] [--rate-limit-rate P] [--json] [--per-account N]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+API_PATH = "/api/v1"
+MOCK_TOKEN = "mock-token"
+
+# charge_state values, see CHARGE_STATES
+STATE_DISCONNECTED = 0
+STATE_CONNECTED = 1
+STATE_CHARGING = 2
+STATE_PAUSED = 4
+
+
+@dataclass
+class MockCharger:
+    """A simulated Trydan.
+
+    The charge state follows the vehicle (`plug`) and the commands: a plugged
+    in charger charges unless paused or locked, power follows the intensity
+    and energy accumulates while charging. A reboot takes the charger offline
+    for `reboot_time` seconds.
+    """
+
+    device_id: str
+    token: str = MOCK_TOKEN
+    json_format: bool = False
+    plugged: bool = True
+    paused: bool = False
+    locked: bool = False
+    dynamic: bool = False
+    intensity: int = 16
+    min_intensity: int = 6
+    max_intensity: int = 32
+    voltage: int = 230
+    temperature: int = 30
+    wifi_signal: int = -60
+    firmware: str = "2.1.7"
+    session_energy: float = 0.0
+    session_time: float = 0.0
+    total_energy: float = 1_000_000.0
+    offline_until: float = 0.0
+    _updated: float = field(default_factory=time.monotonic, repr=False)
+
+    @property
+    def charge_state(self) -> int:
+        """Return the state reported to the cloud."""
+        if not self.plugged:
+            return STATE_DISCONNECTED
+        if self.paused:
+            return STATE_PAUSED
+        if self.locked:
+            return STATE_CONNECTED
+        return STATE_CHARGING
+
+    @property
+    def power(self) -> int:
+        """Return the charging power in W."""
+        if self.charge_state != STATE_CHARGING:
+            return 0
+        return self.intensity * self.voltage
+
+    @property
+    def online(self) -> bool:
+        """Return False while rebooting."""
+        return time.monotonic() >= self.offline_until
+
+    def advance(self) -> None:
+        """Account for the energy charged since the last call."""
+        now = time.monotonic()
+        elapsed, self._updated = now - self._updated, now
+        if self.charge_state == STATE_CHARGING:
+            energy = self.power * elapsed / 3600
+            self.session_energy += energy
+            self.total_energy += energy
+            self.session_time += elapsed
+
+    def plug(self, plugged: bool = True) -> None:
+        """Connect or disconnect the vehicle, which ends the session."""
+        self.advance()
+        if not plugged:
+            self.session_energy = self.session_time = 0.0
+        self.plugged = plugged
+
+    def command(self, name: str, value: str | None, reboot_time: float) -> bool:
+        """Apply a command, return False if it is not valid."""
+        self.advance()
+        if name == "intensity":
+            if value is None or not value.isdigit():
+                return False
+            intensity = int(value)
+            if not self.min_intensity <= intensity <= self.max_intensity:
+                return False
+            self.intensity = intensity
+        elif name == "startcharge":
+            self.paused = False
+        elif name == "pausecharge":
+            self.paused = True
+        elif name in ("dynamic", "locked"):
+            if value not in ("0", "1"):
+                return False
+            setattr(self, name, value == "1")
+        elif name == "reboot":
+            self.offline_until = time.monotonic() + reboot_time
+        else:
+            return False
+        return True
+
+    def reported(self) -> dict[str, Any]:
+        """Return the /device/reported fields."""
+        self.advance()
+        return {
+            "power": self.power,
+            "energy": round(self.session_energy, 1),
+            "state": self.charge_state,
+            "intensity": self.intensity,
+            "voltage": self.voltage,
+            "temperature": self.temperature,
+            "session_energy": round(self.session_energy),
+            "session_time": round(self.session_time),
+            "total_energy": round(self.total_energy),
+            "wifi_signal": self.wifi_signal,
+            "dynamic": int(self.dynamic),
+            "paused": int(self.paused),
+            "locked": int(self.locked),
+            "firmware": self.firmware,
+            "max_intensity": self.max_intensity,
+            "min_intensity": self.min_intensity,
+        }
+
+
+def fleet_token(account: int) -> str:
+    """Return the token of a fleet account created by MockCloud.add_fleet."""
+    return f"{MOCK_TOKEN}-{account}"
+
+
+class MockCloud:
+    """aiohttp server answering like V2C Cloud for a set of MockChargers.
+
+    Chargers belong to the account of their token, `token` is the default
+    one. Every request waits `latency` plus up to `jitter` seconds. Requests
+    with an unknown or `revoked` apikey get a 401. Then a request fails with
+    `error_status` with probability `error_rate`, or gets a 429 carrying
+    `retry_after` with probability `rate_limit_rate`. All attributes may be
+    changed while the server runs.
+    """
+
+    def __init__(
+        self,
+        token: str = MOCK_TOKEN,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        reboot_time: float = 5.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize without chargers."""
+        self.token = token
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.reboot_time = reboot_time
+        self.devices: dict[str, MockCharger] = {}
+        self.accounts: dict[str, list[str]] = {token: []}
+        self.revoked: set[str] = set()
+        self.requests: Counter[str] = Counter()
+        self.faults: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    def add_device(
+        self, device_id: str | None = None, token: str | None = None, **state: Any
+    ) -> MockCharger:
+        """Add a charger to an account, `state` sets MockCharger fields."""
+        device_id = device_id or f"MOCK{len(self.devices):04d}"
+        token = token or self.token
+        charger = self.devices[device_id] = MockCharger(device_id, token, **state)
+        self.accounts.setdefault(token, []).append(device_id)
+        return charger
+
+    def add_fleet(self, count: int, per_account: int, **state: Any) -> None:
+        """Add `count` chargers, `per_account` to each token (see fleet_token)."""
+        for index in range(count):
+            self.add_device(token=fleet_token(index // per_account), **state)
+
+    def app(self) -> web.Application:
+        """Return the aiohttp application."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get(f"{API_PATH}/pairings/me", self._pairings)
+        app.router.add_get(f"{API_PATH}/device/reported", self._reported)
+        app.router.add_post(f"{API_PATH}/device/{{command}}", self._command)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL to use instead of API_BASE_URL."""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}{API_PATH}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count, delay, authenticate and inject faults."""
+        self.requests[request.path.removeprefix(API_PATH)] += 1
+        if delay := self.latency + self._random.uniform(0, self.jitter):
+            await asyncio.sleep(delay)
+
+        token = request.headers.get("apikey")
+        if token not in self.accounts or token in self.revoked:
+            self.faults["auth"] += 1
+            return web.Response(status=401, text="Unauthorized")
+        roll = self._random.random()
+        if roll < self.error_rate:
+            self.faults["error"] += 1
+            return web.Response(status=self.error_status, text="Internal error")
+        if roll < self.error_rate + self.rate_limit_rate:
+            self.faults["rate_limit"] += 1
+            return web.Response(
+                status=429,
+                text="Too many requests",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        return await handler(request)
+
+    def _charger(self, request: web.Request) -> MockCharger:
+        """Return the charger named by deviceId, or answer 404/503."""
+        charger = self.devices.get(request.query.get("deviceId", ""))
+        if charger is None or charger.token != request.headers["apikey"]:
+            raise web.HTTPNotFound(text="Device not found")
+        if not charger.online:
+            raise web.HTTPServiceUnavailable(text="Device offline")
+        return charger
+
+    async def _pairings(self, request: web.Request) -> web.Response:
+        """List the chargers of the caller's account."""
+        return web.json_response([
+            {"deviceId": device_id, "tag": f"Trydan {device_id}", "model": "Trydan"}
+            for device_id in self.accounts[request.headers["apikey"]]
+        ])
+
+    async def _reported(self, request: web.Request) -> web.Response:
+        """Report the state of one charger, as text or JSON."""
+        charger = self._charger(request)
+        reported = charger.reported()
+        if charger.json_format:
+            return web.json_response(reported)
+        return web.Response(
+            text=",".join(f"{key}:{value}" for key, value in reported.items())
+        )
+
+    async def _command(self, request: web.Request) -> web.Response:
+        """Apply a command to one charger."""
+        charger = self._charger(request)
+        if not charger.command(
+            request.match_info["command"], request.query.get("value"), self.reboot_time
+        ):
+            raise web.HTTPBadRequest(text="Invalid command")
+        return web.Response(text="OK")
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run a mock cloud until interrupted."""
+    cloud = MockCloud(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    if args.per_account:
+        cloud.add_fleet(args.devices, args.per_account, json_format=args.json)
+    else:
+        for _ in range(args.devices):
+            cloud.add_device(json_format=args.json)
+    url = await cloud.start(args.host, args.port)
+    # Parsed by bench_fleet.py
+    print(f"Serving {args.devices} chargers at {url}", flush=True)
+    for token, device_ids in cloud.accounts.items():
+        if device_ids:
+            print(f"  apikey {token}: {', '.join(device_ids)}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await cloud.stop()
+
+
+def main() -> None:
+    """Parse the arguments and serve."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=3)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--json", action="store_true", help="report JSON")
+    parser.add_argument(
+        "--per-account", type=int, default=0,
+        help="spread the chargers over accounts of this many",
+    )
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""Offline integration checks against scripts/mock_cloud.py.
+
+Starts a mock cloud and a Home Assistant instance in a temporary config
+directory, points the integration at the mock and sets up one config entry
+per simulated charger. Then runs the checks below against the client, the
+parser, the coordinators and the platforms, without any network access.
+
+    python scripts/offline_harness.py [--devices N] [-k PATTERN] [-v]
+
+Exits with status 1 if a check fails.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import logging
+import sys
+import tempfile
+import time
+import traceback
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from homeassistant import bootstrap, config_entries, loader  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+
+from custom_components.v2c_cloud import (  # noqa: E402
+    cassette,
+    coordinator,
+    diagnostics,
+    openmetrics,
+    retry,
+    v2c_api,
+)
+from custom_components.v2c_cloud.const import DATA_ACCOUNTS, DOMAIN  # noqa: E402
+from mock_cloud import MockCloud  # noqa: E402
+
+_LOGGER = logging.getLogger("offline_harness")
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    """Start a bare Home Assistant able to load the integration."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    await hass.async_start()
+    return hass
+
+
+async def async_add_chargers(
+    hass: HomeAssistant,
+    base_url: str,
+    chargers: list[tuple[str, str]],
+    options: dict[str, Any] | None = None,
+) -> list[config_entries.ConfigEntry]:
+    """Point the integration at a mock cloud and add an entry per charger.
+
+    `chargers` holds (api token, device id) pairs.
+    """
+    # Read when the API clients are created
+    v2c_api.API_BASE_URL = base_url
+    entries = []
+    for api_token, device_id in chargers:
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title=device_id,
+            data={"api_token": api_token, "device_id": device_id},
+            source=config_entries.SOURCE_USER,
+            options=dict(options or {}),
+            unique_id=device_id,
+        )
+        await hass.config_entries.async_add(entry)
+        entries.append(entry)
+    await hass.async_block_till_done()
+    return entries
+
+
+@dataclass
+class Harness:
+    """What the checks work with."""
+
+    hass: HomeAssistant
+    cloud: MockCloud
+    entries: list[config_entries.ConfigEntry] = field(default_factory=list)
+
+    def device(self, index: int = 0):
+        """Return the device coordinator of an entry."""
+        return self.hass.data[DOMAIN][self.entries[index].entry_id]
+
+    @property
+    def account(self):
+        """Return the account coordinator shared by the entries."""
+        return next(iter(self.hass.data[DOMAIN][DATA_ACCOUNTS].values()))
+
+    def state(self, domain: str, entity_type: str, index: int = 0):
+        """Return the state of an entity of an entry's charger."""
+        device_id = self.entries[index].unique_id
+        entity_id = er.async_get(self.hass).async_get_entity_id(
+            domain, DOMAIN, f"{device_id}_{entity_type}"
+        )
+        return self.hass.states.get(entity_id)
+
+    async def poll(self) -> None:
+        """Run a fleet poll of every charger now."""
+        account = self.account
+        for device in account._devices.values():
+            device.next_poll = 0
+        account.single_flight.forget()
+        await account.async_refresh()
+        await self.hass.async_block_till_done()
+
+    def reset_faults(self) -> None:
+        """Stop injecting faults and close the circuit breaker."""
+        self.cloud.error_rate = self.cloud.rate_limit_rate = 0.0
+        retry.get_circuit_breaker(self.cloud.url.split("/")[2]).record_success()
+
+
+CHECKS: list[Callable[[Harness], Awaitable[None]]] = []
+
+
+def check(func: Callable[[Harness], Awaitable[None]]):
+    """Register a check, they run in definition order."""
+    CHECKS.append(func)
+    return func
+
+
+@check
+async def client_parses_text_and_json(harness: Harness) -> None:
+    """The client parses both payload formats into the charger's state."""
+    async with aiohttp.ClientSession() as session:
+        for charger in harness.cloud.devices.values():
+            api = v2c_api.V2CCloudAPI(
+                session, harness.cloud.token, charger.device_id,
+                base_url=harness.cloud.url,
+            )
+            status = await api.get_device_status()
+            assert status.intensity == charger.intensity, status
+            assert status.charge_state == charger.charge_state, status
+            assert status.firmware_version == charger.firmware, status
+
+
+@check
+async def cassette_replays_recorded_responses(harness: Harness) -> None:
+    """A recorded cassette holds no token and replays to the same status."""
+    device_ids = list(harness.cloud.devices)
+    with tempfile.TemporaryDirectory() as cassette_dir:
+        path = Path(cassette_dir) / "recorded.jsonl.gz"
+        recorder = cassette.CassetteRecorder(path, harness.cloud.token)
+        async with aiohttp.ClientSession() as session:
+            recorded = [
+                await v2c_api.V2CCloudAPI(
+                    session, harness.cloud.token, device_id,
+                    base_url=harness.cloud.url, recorder=recorder,
+                ).get_device_status()
+                for device_id in device_ids
+            ]
+        await recorder.async_close()
+        with gzip.open(path, "rt", encoding="utf-8") as recorded_file:
+            assert harness.cloud.token not in recorded_file.read()
+
+        replay = cassette.CassetteSession(
+            list(cassette.read_cassette(path)), base_url=harness.cloud.url
+        )
+    replayed = [
+        await v2c_api.V2CCloudAPI(
+            replay, "replayed", device_id, base_url=harness.cloud.url
+        ).get_device_status()
+        for device_id in device_ids
+    ]
+    assert replayed == recorded, (replayed, recorded)
+    assert replay.remaining == 0, replay.remaining
+
+
+@check
+async def entities_show_device_state(harness: Harness) -> None:
+    """Every entry is loaded and its sensors show its charger's values."""
+    for index, entry in enumerate(harness.entries):
+        assert entry.state is config_entries.ConfigEntryState.LOADED, entry.state
+        charger = harness.cloud.devices[entry.unique_id]
+        power = harness.state("sensor", "charge_power", index)
+        assert power.state == str(charger.power), power
+        charge_state = harness.state("sensor", "charge_state", index)
+        assert charge_state.state == "connected_charging", charge_state
+
+
+@check
+async def poll_follows_device(harness: Harness) -> None:
+    """Unplugging the vehicle shows up after the next poll."""
+    harness.cloud.devices[harness.entries[0].unique_id].plug(False)
+    await harness.poll()
+    state = harness.state("sensor", "charge_state")
+    assert state.state == "disconnected", state
+    assert harness.state("sensor", "charge_power").state == "0"
+    harness.cloud.devices[harness.entries[0].unique_id].plug(True)
+    await harness.poll()
+
+
+@check
+async def intensity_command_reaches_device(harness: Harness) -> None:
+    """Settings in quick succession reach the charger as one write of the last."""
+    number = harness.state("number", "intensity")
+    command = harness.device().intensity_command
+    writes = harness.cloud.requests["/device/intensity"]
+    collapsed = command.collapsed
+    await asyncio.gather(
+        *(
+            harness.hass.services.async_call(
+                "number", "set_value",
+                {"entity_id": number.entity_id, "value": value},
+                blocking=True,
+            )
+            for value in (18, 19, 20)
+        )
+    )
+    charger = harness.cloud.devices[harness.entries[0].unique_id]
+    assert charger.intensity == 20, charger.intensity
+    assert harness.cloud.requests["/device/intensity"] == writes + 1
+    assert command.collapsed - collapsed == 2, command.stats
+    state = harness.state("number", "intensity")
+    assert state.state == "20", state
+
+    # The deferred poll confirms the value
+    requests = harness.cloud.requests["/device/reported"]
+    await asyncio.sleep(coordinator.OPTIMISTIC_VERIFY_DELAY + 0.5)
+    await harness.hass.async_block_till_done()
+    assert harness.cloud.requests["/device/reported"] > requests
+    assert harness.device().reported_data.intensity == 20
+
+
+@check
+async def diagnostics_show_recent_requests(harness: Harness) -> None:
+    """The diagnostics download holds the last payloads, without the token."""
+    result = await diagnostics.async_get_config_entry_diagnostics(
+        harness.hass, harness.entries[0]
+    )
+    history = result["history"]
+    assert history["payloads"], history
+    kinds = {event["kind"] for event in history["events"]}
+    assert kinds == {"request", "parse", "command"}, kinds
+    assert result["device"]["commands"]["collapsed"], result["device"]["commands"]
+    assert harness.cloud.token not in repr(result)
+
+
+@check
+async def openmetrics_export_reuses_cached_samples(harness: Harness) -> None:
+    """A scrape renders every charger once per change, without cloud calls."""
+    exporter = openmetrics.OpenMetricsExporter()
+    for entry in harness.entries:
+        exporter.async_add(harness.hass.data[DOMAIN][entry.entry_id])
+    requests = sum(harness.cloud.requests.values())
+    text = exporter.async_render()
+    assert text.endswith("# EOF\n"), text[-100:]
+    for entry in harness.entries:
+        charger = harness.cloud.devices[entry.unique_id]
+        sample = (
+            f'v2c_cloud_charge_power_watts{{device_id="{entry.unique_id}"}} '
+            f"{charger.power}\n"
+        )
+        assert sample in text, sample
+    assert exporter.async_render() == text
+    assert sum(harness.cloud.requests.values()) == requests
+
+    await harness.poll()
+    assert exporter.async_render() != text
+
+
+@check
+async def failed_polls_serve_stale_data_within_budget(harness: Harness) -> None:
+    """Failures keep the last values, marked stale, until the budget is spent."""
+    budget = harness.device().stale_budget.max_failures
+    harness.cloud.error_rate = 1.0
+    try:
+        for failure in range(1, budget + 1):
+            await harness.poll()
+            state = harness.state("sensor", "charge_state")
+            if failure < budget:
+                assert state.attributes["stale"] is True, state
+            else:
+                assert state.state == "unavailable", state
+    finally:
+        harness.reset_faults()
+    await harness.poll()
+    state = harness.state("sensor", "charge_state")
+    assert state.state == "connected_charging", state
+    assert state.attributes["stale"] is False, state
+
+
+@check
+async def rate_limit_backs_off(harness: Harness) -> None:
+    """A 429 keeps the data and waits for Retry-After before polling again."""
+    harness.cloud.rate_limit_rate, harness.cloud.retry_after = 1.0, 120
+    try:
+        await harness.poll()
+    finally:
+        harness.reset_faults()
+    device = harness.device()
+    assert device.next_poll - time.monotonic() > 100, device.next_poll
+    assert harness.state("sensor", "charge_power").state != "unavailable"
+    await harness.poll()
+
+
+@check
+async def rejected_token_starts_reauth(harness: Harness) -> None:
+    """A 401 stops the fleet poll and asks every entry for a new token."""
+    harness.cloud.revoked.add(harness.cloud.token)
+    try:
+        await harness.poll()
+        requests = sum(harness.cloud.requests.values())
+        assert harness.account.auth_failed
+        harness.account.async_reschedule()
+        await asyncio.sleep(0.5)
+        assert sum(harness.cloud.requests.values()) == requests
+        flows = harness.hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+        reauth = {flow["context"]["entry_id"] for flow in flows}
+        assert reauth == {entry.entry_id for entry in harness.entries}, reauth
+    finally:
+        harness.cloud.revoked.clear()
+
+
+async def run(args: argparse.Namespace) -> bool:
+    """Run the checks, return True if all passed."""
+    # Keep retries of injected failures and command verification short
+    v2c_api.API_RETRY_BACKOFF_BASE = 0.01
+    coordinator.OPTIMISTIC_VERIFY_DELAY = 0.5
+
+    cloud = MockCloud(seed=0)
+    for index in range(args.devices):
+        cloud.add_device(json_format=index % 2 == 1)
+    await cloud.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_start_hass(config_dir)
+        harness = Harness(hass, cloud)
+        harness.entries = await async_add_chargers(
+            hass,
+            cloud.url,
+            [(charger.token, charger.device_id) for charger in cloud.devices.values()],
+        )
+
+        passed = True
+        for func in CHECKS:
+            if args.keyword and args.keyword not in func.__name__:
+                continue
+            start = time.perf_counter()
+            try:
+                await func(harness)
+            except Exception:  # pylint: disable=broad-except
+                passed = False
+                print(f"FAIL {func.__name__}")
+                traceback.print_exc()
+            else:
+                print(
+                    f"PASS {func.__name__} "
+                    f"({(time.perf_counter() - start) * 1000:.0f} ms)"
+                )
+
+        for entry in harness.entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+
+    await cloud.stop()
+    print(f"Requests served: {dict(cloud.requests)}, faults: {dict(cloud.faults)}")
+    return passed
+
+
+def main() -> None:
+    """Parse the arguments and run the checks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=2)
+    parser.add_argument("-k", "--keyword", help="only run checks matching this")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+    sys.exit(0 if asyncio.run(run(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Replay recorded V2C Cloud traffic through the API client and parser.
+
+Feeds every /device/reported answer in the cassettes (see cassette.py and
+the "Record API traffic" option) to V2CCloudAPI.get_device_status, the
+retries and failures included, and reports per firmware version how many
+parsed, with the replay speed. At full speed it benchmarks the client and
+parser on real traffic, with --realtime the answers of each device come
+at the pace they were recorded.
+
+    python scripts/replay_cassette.py CASSETTE [CASSETTE ...] [--realtime]
+        [-r REPEAT] [-v]
+
+Exits with status 1 if a payload answered with 200 did not parse, so a new
+firmware format can be checked in as a regression test.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+from bench_parser import load_module
+
+REPORTED = "/device/reported"
+
+
+async def replay(args: argparse.Namespace) -> bool:
+    """Replay the cassettes, return False if a 200 answer did not parse."""
+    cassette = load_module("cassette")
+    exceptions = load_module("exceptions")
+    retry = load_module("retry")
+    singleflight = load_module("singleflight")
+    v2c_api = load_module("v2c_api")
+    if not args.realtime:
+        v2c_api.API_RETRY_BACKOFF_BASE = 0.0
+
+    # deviceId -> its /device/reported interactions, in recording order
+    devices: defaultdict[str, list] = defaultdict(list)
+    for path in args.cassettes:
+        for interaction in cassette.read_cassette(path):
+            if interaction["e"] == REPORTED:
+                devices[interaction["p"]["deviceId"]].append(interaction)
+    if not devices:
+        print("No /device/reported requests recorded")
+        return True
+
+    outcomes: defaultdict[str, Counter] = defaultdict(Counter)
+    unparsed = []
+    calls = 0
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for device_id, interactions in devices.items():
+            session = cassette.CassetteSession(interactions, realtime=args.realtime)
+            # Every call must reach the cassette, not reuse the last result
+            api = v2c_api.V2CCloudAPI(
+                session, "replayed", device_id,
+                single_flight=singleflight.SingleFlight(0),
+            )
+            while session.remaining:
+                # Recorded failures must not stop the replay of later answers
+                retry.get_circuit_breaker(
+                    urlsplit(v2c_api.API_BASE_URL).netloc
+                ).record_success()
+                before = session.replayed
+                calls += 1
+                try:
+                    status = await api.get_device_status()
+                except exceptions.V2CCloudMalformedResponseError as err:
+                    outcomes["unknown"]["malformed"] += 1
+                    # Only the last attempt of the call got this far
+                    answer = interactions[session.replayed - 1]
+                    unparsed.append((device_id, answer.get("b", "")))
+                    if args.verbose:
+                        print(f"{device_id}: {err}")
+                except exceptions.V2CCloudError as err:
+                    outcomes["unknown"][type(err).__name__] += 1
+                else:
+                    outcomes[status.firmware_version or "unknown"]["parsed"] += 1
+                if session.replayed == before:
+                    break
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(devices)} devices, {calls} status calls in {elapsed:.3f}s "
+          f"({calls / elapsed:.0f}/s, {elapsed / calls * 1e6:.1f} us per call)")
+    for firmware, counts in sorted(outcomes.items()):
+        print(f"  firmware {firmware:<10} " + ", ".join(
+            f"{outcome}: {count}" for outcome, count in sorted(counts.items())
+        ))
+    for device_id, body in unparsed[:10]:
+        print(f"  unparsed {device_id}: {body[:200]!r}")
+    return not unparsed
+
+
+def main() -> None:
+    """Parse the arguments and replay."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cassettes", nargs="+")
+    parser.add_argument("--realtime", action="store_true")
+    parser.add_argument("-r", "--repeat", type=int, default=1)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(replay(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()